@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# Stand-in for rtl_tcp without a dongle, for benchmarking the monitor and its
+# streaming features. It accepts rtl_tcp's options, sends the "RTL0" header,
+# understands the 5-byte command protocol (retune, sample rate, gain, ...) and
+# streams synthetic 8-bit IQ (tones plus noise) at exactly the sample rate.
+#
+# Like rtl_tcp, samples are produced in 256 KiB buffers on a fixed clock and
+# queued for the client, and the sender takes the whole queue at once. The
+# producer prints "ll+, now N" / "ll-, now N" when the number of buffers queued
+# behind the head changes, so a client that keeps up produces no output. With
+# -n the oldest buffer is dropped silently once the queue is full, as rtl_tcp
+# does (the reported depth just stops changing).
+#
+#   python3 rtl_tcp_emulator.py -a 127.0.0.1 -p 1234 -s 2400000
+#
+# As the service:  ExecStart=/usr/bin/python3 /usr/local/bin/rtl_tcp_emulator.py $RTL_TCP_ARGS
+import argparse
+import cmath
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+
+HEADER = struct.Struct('>4sII')
+COMMAND = struct.Struct('>BI')
+TUNER_R820T = 5
+R820T_GAIN_COUNT = 29
+BUFFER_BYTES = 16 * 32 * 512
+# Each table block holds a whole number of periods of every tone, so blocks
+# can be played in any order without phase jumps; their noise differs.
+BLOCK_SAMPLES = 65536
+NOISE_BLOCKS = 8
+
+COMMAND_NAMES = {
+    0x01: "freq",
+    0x02: "sample rate",
+    0x03: "gain mode",
+    0x04: "gain",
+    0x05: "freq correction",
+    0x06: "if gain",
+    0x07: "test mode",
+    0x08: "agc mode",
+    0x09: "direct sampling",
+    0x0a: "offset tuning",
+    0x0b: "rtl xtal",
+    0x0c: "tuner xtal",
+    0x0d: "tuner gain by index",
+    0x0e: "bias tee"
+}
+
+
+def log(message):
+    print(message, flush=True)
+
+
+# rtl_tcp numbers accept a k/M/G suffix ("2.4M")
+def parse_number(text):
+    scale = {"k": 1e3, "M": 1e6, "G": 1e9}.get(text[-1:], 1)
+    return float(text[:-1] if scale != 1 else text) * scale
+
+
+def build_blocks(sample_rate, tones, noise, seed=None):
+    rng = random.Random(seed)
+    # Round each tone to the nearest frequency with a whole number of periods per block
+    steps = [(amplitude, 2 * cmath.pi * round(offset / sample_rate * BLOCK_SAMPLES) / BLOCK_SAMPLES)
+             for offset, amplitude in tones]
+    signal = [sum(amplitude * cmath.exp(1j * step * n) for amplitude, step in steps)
+              for n in range(BLOCK_SAMPLES)]
+
+    blocks = []
+    for _ in range(NOISE_BLOCKS):
+        block = bytearray(BLOCK_SAMPLES * 2)
+        for n, value in enumerate(signal):
+            i = 127.5 + 127.5 * (value.real + rng.gauss(0, noise))
+            q = 127.5 + 127.5 * (value.imag + rng.gauss(0, noise))
+            block[2 * n] = min(255, max(0, int(i)))
+            block[2 * n + 1] = min(255, max(0, int(q)))
+        blocks.append(bytes(block))
+    return blocks
+
+
+class Emulator:
+    def __init__(self, args):
+        self.args = args
+        self.sample_rate = int(parse_number(args.s))
+        self.frequency = int(parse_number(args.f))
+        self.max_buffers = args.n
+        self.blocks = build_blocks(self.sample_rate, args.tones, args.noise, args.seed)
+        self.build_lock = threading.Lock()
+        self.queue = []
+        self.queued = 0
+        self.changed = threading.Condition()
+        self.client_open = False
+
+    def serve(self):
+        listener = socket.create_server((self.args.a, self.args.p))
+        log("listening...")
+        log(f"Use the device argument 'rtl_tcp={self.args.a}:{self.args.p}' in OsmoSDR "
+            "(gr-osmosdr) source\nto receive samples in GRC and control rtl_tcp parameters "
+            "(frequency, gain, ...).")
+        while True:
+            sock, address = listener.accept()
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            log("client accepted!")
+            self.handle(sock)
+            log("all threads dead..")
+            log("listening...")
+
+    def handle(self, sock):
+        sock.sendall(HEADER.pack(b'RTL0', TUNER_R820T, R820T_GAIN_COUNT))
+        with self.changed:
+            self.queue = []
+            self.queued = 0
+            self.client_open = True
+        threading.Thread(target=self.read_commands, args=(sock,), daemon=True).start()
+        producer = threading.Thread(target=self.produce, daemon=True)
+        producer.start()
+
+        started = time.monotonic()
+        sent = 0
+        try:
+            while True:
+                with self.changed:
+                    while self.client_open and not self.queue:
+                        self.changed.wait()
+                    if not self.client_open:
+                        break
+                    # Like rtl_tcp's sender: take the whole list at once
+                    buffers, self.queue = self.queue, []
+                for buffer in buffers:
+                    sock.sendall(buffer)
+                    sent += len(buffer)
+        except OSError:
+            pass
+        finally:
+            with self.changed:
+                self.client_open = False
+                self.changed.notify_all()
+            sock.close()
+            producer.join()
+            elapsed = max(time.monotonic() - started, 1e-9)
+            log(f"sent {sent} bytes in {elapsed:.1f} s ({sent / 2 / elapsed / 1e6:.3f} MS/s)")
+
+    # Like the USB callback: one buffer every BUFFER_BYTES / 2 / sample_rate seconds
+    def produce(self):
+        deadline = time.monotonic()
+        while self.client_open:
+            blocks_per_buffer = BUFFER_BYTES // (BLOCK_SAMPLES * 2)
+            buffer = b''.join(self.blocks[random.randrange(NOISE_BLOCKS)] for _ in range(blocks_per_buffer))
+
+            deadline += BUFFER_BYTES / 2 / self.sample_rate
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self.changed:
+                if not self.client_open:
+                    break
+                # Counted and reported as rtl_tcp does: buffers behind the head,
+                # and nothing when the sender has already emptied the list
+                if self.queue:
+                    queued = len(self.queue) - 1
+                    if self.max_buffers and queued == self.max_buffers + 2:
+                        self.queue.pop(0)
+                    self.queue.append(buffer)
+                    if queued > self.queued:
+                        log(f"ll+, now {queued}")
+                    elif queued < self.queued:
+                        log(f"ll-, now {queued}")
+                    self.queued = queued
+                else:
+                    self.queue.append(buffer)
+                self.changed.notify_all()
+
+    def read_commands(self, sock):
+        buffer = b''
+        try:
+            while True:
+                data = sock.recv(64)
+                if not data:
+                    break
+                buffer += data
+                while len(buffer) >= COMMAND.size:
+                    self.command(*COMMAND.unpack(buffer[:COMMAND.size]))
+                    buffer = buffer[COMMAND.size:]
+        except OSError:
+            pass
+        log("comm recv bye")
+        with self.changed:
+            self.client_open = False
+            self.changed.notify_all()
+
+    def command(self, code, value):
+        name = COMMAND_NAMES.get(code)
+        if name is None:
+            log(f"unknown command 0x{code:02x} {value}")
+            return
+        signed = value - (1 << 32) if value & 0x80000000 else value
+        log(f"set {name} {signed}")
+        if code == 0x01:
+            self.frequency = value
+        elif code == 0x02 and value and value != self.sample_rate:
+            # The producer clock follows the new rate at once. The tables take
+            # seconds to build, so that happens off this thread (commands queued
+            # behind this one are not delayed); until then the old ones are played.
+            self.sample_rate = value
+            threading.Thread(target=self.rebuild_blocks, args=(value,), daemon=True).start()
+
+    def rebuild_blocks(self, sample_rate):
+        with self.build_lock:
+            # Skip rates already superseded by a later command
+            if sample_rate != self.sample_rate:
+                return
+            blocks = build_blocks(sample_rate, self.args.tones, self.args.noise, self.args.seed)
+            if sample_rate == self.sample_rate:
+                self.blocks = blocks
+
+
+def parse_tone(text):
+    offset, _, amplitude = text.partition('@')
+    return parse_number(offset), float(amplitude or 0.3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="rtl_tcp emulator with synthetic IQ")
+    parser.add_argument('-a', default='127.0.0.1', help="listen address")
+    parser.add_argument('-p', type=int, default=1234, help="listen port")
+    parser.add_argument('-f', default='100000000', help="frequency to tune to [Hz]")
+    parser.add_argument('-g', default='0', help="gain (0 for auto)")
+    parser.add_argument('-s', default='2048000', help="sample rate in Hz")
+    parser.add_argument('-b', type=int, default=15, help="number of buffers (accepted, unused)")
+    parser.add_argument('-n', type=int, default=500, help="max number of queued buffers")
+    parser.add_argument('-d', default='0', help="device index (accepted, unused)")
+    parser.add_argument('-P', type=int, default=0, help="ppm error (accepted, unused)")
+    parser.add_argument('-T', action='store_true', help="bias tee (accepted, unused)")
+    parser.add_argument('--tone', dest='tones', action='append', type=parse_tone,
+                        help="tone as <offset Hz>[@<amplitude>], repeatable (default 100k@0.3 and -250k@0.2)")
+    parser.add_argument('--noise', type=float, default=0.05, help="noise standard deviation (full scale = 1)")
+    parser.add_argument('--seed', type=int, help="noise seed for reproducible output")
+    args = parser.parse_args()
+    if args.tones is None:
+        args.tones = [(100e3, 0.3), (-250e3, 0.2)]
+
+    log("Found 1 device(s):\n  0:  Emulated, RTL2838UHIDIR, SN: 00000001\n")
+    log(f"Using device {args.d}: Emulated RTL2838UHIDIR")
+    log(f"Tuned to {int(parse_number(args.f))} Hz.")
+    log(f"Sampling at {int(parse_number(args.s))} S/s.")
+    try:
+        Emulator(args).serve()
+    except KeyboardInterrupt:
+        log("Signal caught, exiting!")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Load generator for the web monitor: simulates N dashboards polling /api/status
+# and reports throughput and latency percentiles. Each client reuses one
+# connection while the server keeps it alive (waitress) and reconnects when the
+# server closes it after a response (threaded, dev).
+#
+#   python3 rtl_web_bench.py --url http://127.0.0.1:5678 --clients 10 --duration 30
+#
+# Run it against "--server dev", "--server threaded" and "--server waitress" to compare.
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def client_loop(host, port, path, interval, deadline, latencies, errors, lock):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    version = ''
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            conn.request('GET', f"{path}?since={version}" if path == '/api/status' else path)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            if path == '/api/status':
+                version = json.loads(body).get('version', '')
+            elapsed = time.monotonic() - started
+            with lock:
+                latencies.append(elapsed)
+        except Exception:
+            with lock:
+                errors[0] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+        if interval:
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+    conn.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RTL-SDR web monitor")
+    parser.add_argument('--url', default='http://127.0.0.1:5678')
+    parser.add_argument('--path', default='/api/status')
+    parser.add_argument('--clients', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="seconds between requests per client (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    deadline = time.monotonic() + args.duration
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    threads = [
+        threading.Thread(target=client_loop, daemon=True,
+                         args=(url.hostname, url.port or 80, args.path, args.interval,
+                               deadline, latencies, errors, lock))
+        for _ in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    print(f"clients:  {args.clients}")
+    print(f"requests: {len(latencies)} ({len(latencies) / args.duration:.1f}/s), errors: {errors[0]}")
+    print(f"latency:  p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 import time
 import subprocess
 import psutil
 import threading
 import os
 import json
-import platform
 import re
 import shutil
+import ctypes
+import select
+import struct
+import socket
+import math
+import argparse
+import shlex
+from array import array
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
 
 # No GPIO support in this version
 
@@ -29,7 +40,27 @@ status = {
     "swap_percent": 0,
     "network_sent": 0,
     "network_recv": 0,
+    "network_sent_rate": 0,
+    "network_recv_rate": 0,
+    "network_interfaces": {},
+    "stream_sent_rate": 0,
+    "stream_rtt_ms": 0,
+    "stream_send_queue": 0,
+    "stream_unsent_bytes": 0,
+    "stream_retrans_rate": 0,
+    "streaming_clients": [],
+    "stream_backlog": 0,
+    "stream_backlog_peak": 0,
+    "stream_drops": 0,
+    "stream_dropping": False,
+    "stream_dropped_bytes": 0,
+    "stream_drop_rate": 0,
+    "stream_backlog_sustained": False,
     "rtl_tcp_pid": None,
+    "temperatures": [],
+    "jobs": [],
+    "config_apply": None,
+    "relay": None,
     "update_time": 0,
     "gpio_available": False  # Always False in this version
 }
@@ -45,88 +76,774 @@ def is_service_running(service_name="rtl_tcp.service"):
     except Exception:
         return False
 
+# inotify constants (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0o2000000
+
+# Minimal inotify wrapper using libc directly (no extra dependency)
+class Inotify:
+    def __init__(self):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+    
+    def rm_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+    
+    # Returns a list of (wd, mask, name) tuples, empty on timeout
+    def read_events(self, timeout=None):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        data = os.read(self.fd, 4096)
+        events = []
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, mask, cookie, length = struct.unpack_from('iIII', data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b'\0').decode(errors='replace')
+            events.append((wd, mask, name))
+            offset += 16 + length
+        return events
+    
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+# Find the cgroup v2 hierarchy (unified or hybrid layout)
+def find_cgroup2_root():
+    for path in ('/sys/fs/cgroup', '/sys/fs/cgroup/unified'):
+        if os.path.exists(os.path.join(path, 'cgroup.controllers')):
+            return path
+    return None
+
+# Tracks the rtl_tcp unit state from cgroup events instead of forking systemctl.
+# systemd creates <cgroup>/system.slice/<unit> while the unit runs and the kernel
+# flags changes of its "populated" key in cgroup.events, so both are watched with
+# inotify. Point cgroup_root at a scratch directory to drive it from a fake systemd.
+# Without cgroup v2 it falls back to polling "systemctl is-active" every poll_interval.
+class ServiceStateTracker:
+    def __init__(self, service_name="rtl_tcp.service", cgroup_root=None,
+                 slice_name="system.slice", poll_interval=5.0):
+        self.service_name = service_name
+        self.cgroup_root = cgroup_root if cgroup_root is not None else find_cgroup2_root()
+        self.slice_name = slice_name
+        self.poll_interval = poll_interval
+        self.active = False
+        self.mode = "starting"
+        self.last_change = 0
+        self._listeners = []
+        self._thread = None
+    
+    @property
+    def unit_dir(self):
+        if not self.cgroup_root:
+            return None
+        return os.path.join(self.cgroup_root, self.slice_name, self.service_name)
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+    
+    def is_active(self):
+        return self.active
+    
+    # Called from the tracker thread whenever the unit state flips
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+    
+    def _set_active(self, active):
+        if active != self.active:
+            self.active = active
+            self.last_change = time.time()
+            for callback in self._listeners:
+                callback()
+    
+    def _read_populated(self):
+        try:
+            with open(os.path.join(self.unit_dir, 'cgroup.events'), 'r') as f:
+                for line in f:
+                    key, _, value = line.partition(' ')
+                    if key == 'populated':
+                        return value.strip() == '1'
+        except OSError:
+            pass
+        return False
+    
+    def _run(self):
+        if self.cgroup_root:
+            try:
+                self._watch_cgroup()
+                return
+            except OSError as e:
+                print(f"cgroup watch unavailable, polling systemctl: {e}")
+        self._poll_systemctl()
+    
+    def _watch_cgroup(self):
+        inotify = Inotify()
+        try:
+            slice_dir = os.path.join(self.cgroup_root, self.slice_name)
+            slice_wd = inotify.add_watch(slice_dir, IN_CREATE | IN_DELETE | IN_MOVED_TO | IN_MOVED_FROM)
+            unit_wds = set()
+            self.mode = "cgroup"
+            
+            while True:
+                if not unit_wds:
+                    # The directory watch also catches a cgroup.events file that shows up late
+                    for path, mask in ((self.unit_dir, IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO),
+                                       (os.path.join(self.unit_dir, 'cgroup.events'), IN_MODIFY)):
+                        try:
+                            unit_wds.add(inotify.add_watch(path, mask))
+                        except OSError:
+                            pass
+                # Re-read after (re)arming the watches so no transition is missed
+                self._set_active(bool(unit_wds) and self._read_populated())
+                
+                for wd, mask, name in inotify.read_events(timeout=60):
+                    if wd == slice_wd and name == self.service_name:
+                        if mask & (IN_DELETE | IN_MOVED_FROM):
+                            for unit_wd in unit_wds:
+                                inotify.rm_watch(unit_wd)
+                            unit_wds = set()
+                    elif mask & IN_IGNORED:
+                        unit_wds.discard(wd)
+        finally:
+            inotify.close()
+    
+    def _poll_systemctl(self):
+        self.mode = "poll"
+        while True:
+            self._set_active(is_service_running(self.service_name))
+            time.sleep(self.poll_interval)
+
+service_tracker = ServiceStateTracker("rtl_tcp.service")
+
+# Holds a psutil handle on the unit's main process. The PID is taken from the
+# unit's cgroup.procs (or systemd's MainPID without cgroup v2) and is only
+# resolved again when the process exits or the unit changes state.
+class ProcessTracker:
+    def __init__(self, state_tracker, service_name="rtl_tcp.service", retry_interval=5.0):
+        self.state_tracker = state_tracker
+        self.service_name = service_name
+        self.retry_interval = retry_interval
+        self.process = None
+        self._resolved_for = None
+        self._next_retry = 0
+    
+    def get_pid(self):
+        if not self.state_tracker.is_active():
+            self.process = None
+            return None
+        
+        state_change = self.state_tracker.last_change
+        proc = self.process
+        # psutil.Process.is_running() compares create_time, so a recycled PID is rejected
+        if proc is not None and self._resolved_for == state_change and proc.is_running():
+            return proc.pid
+        
+        self.process = None
+        now = time.monotonic()
+        if self._resolved_for == state_change and now < self._next_retry:
+            return None
+        self._resolved_for = state_change
+        self._next_retry = now + self.retry_interval
+        self.process = self._resolve()
+        return self.process.pid if self.process else None
+    
+    def _cgroup_pids(self):
+        unit_dir = self.state_tracker.unit_dir
+        if not unit_dir:
+            return []
+        try:
+            with open(os.path.join(unit_dir, 'cgroup.procs'), 'r') as f:
+                return [int(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return []
+    
+    def _main_pid(self):
+        try:
+            result = subprocess.run(
+                ["systemctl", "show", "-p", "MainPID", "--value", self.service_name],
+                capture_output=True, text=True, check=False
+            )
+            pid = int(result.stdout.strip() or 0)
+            return [pid] if pid > 0 else []
+        except Exception:
+            return []
+    
+    def _resolve(self):
+        pids = self._cgroup_pids() or self._main_pid()
+        procs = []
+        for pid in pids:
+            try:
+                procs.append(psutil.Process(pid))
+            except psutil.Error:
+                pass
+        # The main process is the one whose parent lives outside the unit
+        for proc in procs:
+            try:
+                if proc.ppid() not in pids:
+                    return proc
+            except psutil.Error:
+                pass
+        return procs[0] if procs else None
+
+process_tracker = ProcessTracker(service_tracker, "rtl_tcp.service")
+
 # Get rtl_tcp PID
 def get_rtl_tcp_pid():
     try:
-        result = subprocess.run(
-            ["pgrep", "-f", "rtl_tcp"],
-            capture_output=True, text=True, check=False
-        )
-        if result.stdout.strip():
-            return int(result.stdout.strip())
-        return None
+        return process_tracker.get_pid()
     except Exception:
         return None
 
-# Check streaming connections
-def check_streaming_connections():
+# sock_diag netlink constants (see sock_diag(7))
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST = 0x01
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+TCP_ESTABLISHED = 1
+INET_DIAG_REQ_BYTECODE = 1
+INET_DIAG_BC_S_GE = 2
+INET_DIAG_BC_S_LE = 3
+INET_DIAG_INFO = 2
+
+# struct tcp_info fields we use: (name, offset, format). Older kernels send a
+# shorter struct, so fields past its end are simply left out.
+TCP_INFO_FIELDS = [
+    ("retransmits", 2, '=B'),
+    ("rtt", 68, '=I'),
+    ("rttvar", 72, '=I'),
+    ("snd_cwnd", 80, '=I'),
+    ("total_retrans", 100, '=I'),
+    ("bytes_acked", 120, '=Q'),
+    ("notsent_bytes", 144, '=I'),
+    ("delivery_rate", 160, '=Q'),
+    ("bytes_sent", 200, '=Q')
+]
+
+# Lists ESTABLISHED TCP sockets on one local port. The kernel does the
+# filtering via an inet_diag bytecode (sport >= port && sport <= port), so only
+# matching sockets are returned, each with its tcp_info counters. Falls back to
+# a single regex pass over /proc/net/tcp{,6} (no tcp_info) when sock_diag is
+# not available.
+class ConnectionProbe:
+    def __init__(self, port=1234):
+        self.port = int(port)
+        self.mode = "netlink"
+        self._sock = None
+        self._seq = 0
+        self._lock = threading.Lock()
+    
+    def connections(self):
+        with self._lock:
+            if self.mode == "netlink":
+                try:
+                    return self._netlink_connections()
+                except OSError as e:
+                    print(f"sock_diag unavailable, parsing /proc/net/tcp: {e}")
+                    self._close()
+                    self.mode = "procfs"
+            return self._procfs_connections()
+    
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+    
+    def _request(self, family):
+        port = self.port
+        bytecode = struct.pack('=BBHBBHBBHBBH',
+                               INET_DIAG_BC_S_GE, 8, 20, 0, 0, port,
+                               INET_DIAG_BC_S_LE, 8, 12, 0, 0, port)
+        attr = struct.pack('=HH', 4 + len(bytecode), INET_DIAG_REQ_BYTECODE) + bytecode
+        req = struct.pack('=BBBxI', family, socket.IPPROTO_TCP, 1 << (INET_DIAG_INFO - 1),
+                          1 << TCP_ESTABLISHED) + bytes(48)
+        self._seq += 1
+        header = struct.pack('=IHHII', 16 + len(req) + len(attr), SOCK_DIAG_BY_FAMILY,
+                             NLM_F_REQUEST | NLM_F_DUMP, self._seq, 0)
+        return header + req + attr
+    
+    def _netlink_connections(self):
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG)
+        result = []
+        for family in (socket.AF_INET, socket.AF_INET6):
+            self._sock.send(self._request(family))
+            done = False
+            while not done:
+                data = self._sock.recv(65536)
+                offset = 0
+                while offset + 16 <= len(data):
+                    length, msg_type, flags, seq, pid = struct.unpack_from('=IHHII', data, offset)
+                    if length < 16:
+                        break
+                    if msg_type == NLMSG_DONE:
+                        done = True
+                    elif msg_type == NLMSG_ERROR:
+                        error = -struct.unpack_from('=i', data, offset + 16)[0]
+                        raise OSError(error, os.strerror(error))
+                    elif msg_type == SOCK_DIAG_BY_FAMILY and seq == self._seq:
+                        result.append(self._parse_diag_msg(data[offset + 16:offset + length]))
+                    offset += (length + 3) & ~3
+        return result
+    
+    def _parse_diag_msg(self, msg):
+        family = msg[0]
+        sport, dport = struct.unpack_from('>HH', msg, 4)
+        if family == socket.AF_INET:
+            remote = socket.inet_ntop(socket.AF_INET, msg[24:28])
+        else:
+            remote = socket.inet_ntop(socket.AF_INET6, msg[24:40])
+        rqueue, wqueue, uid, inode = struct.unpack_from('=IIII', msg, 56)
+        conn = {
+            "local_port": sport,
+            "remote": f"{remote}:{dport}",
+            "recv_queue": rqueue,
+            "send_queue": wqueue,
+            "inode": inode
+        }
+        
+        offset = 72
+        while offset + 4 <= len(msg):
+            attr_len, attr_type = struct.unpack_from('=HH', msg, offset)
+            if attr_len < 4:
+                break
+            if attr_type == INET_DIAG_INFO:
+                info = msg[offset + 4:offset + attr_len]
+                for name, field_offset, fmt in TCP_INFO_FIELDS:
+                    if field_offset + struct.calcsize(fmt) <= len(info):
+                        conn[name] = struct.unpack_from(fmt, info, field_offset)[0]
+            offset += (attr_len + 3) & ~3
+        return conn
+    
+    def _procfs_connections(self):
+        # st 01 == TCP_ESTABLISHED; addresses are hex, ports big-endian hex
+        pattern = re.compile(
+            r'^\s*\d+: [0-9A-F]+:%04X ([0-9A-F]+):([0-9A-F]{4}) 01 ([0-9A-F]+):([0-9A-F]+)'
+            r' \S+ \S+ +\d+ +\d+ (\d+)' % self.port, re.M)
+        result = []
+        for path, family in (('/proc/net/tcp', socket.AF_INET), ('/proc/net/tcp6', socket.AF_INET6)):
+            try:
+                with open(path, 'r') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            for match in pattern.finditer(content):
+                raw = bytes.fromhex(match.group(1))
+                # The kernel prints each 32-bit word in host (little-endian) order
+                addr = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+                result.append({
+                    "local_port": self.port,
+                    "remote": f"{socket.inet_ntop(family, addr)}:{int(match.group(2), 16)}",
+                    "recv_queue": int(match.group(4), 16),
+                    "send_queue": int(match.group(3), 16),
+                    "inode": int(match.group(5))
+                })
+        return result
+
+connection_probe = ConnectionProbe(1234)
+
+# Get established connections on the rtl_tcp port
+def get_streaming_connections():
     try:
-        connections = psutil.net_connections(kind='tcp')
-        for conn in connections:
-            if conn.laddr.port == 1234 and conn.status == 'ESTABLISHED':
-                return True
-        return False
-    except:
-        try:
-            result = subprocess.run(
-                ["netstat", "-tn"], 
-                capture_output=True, 
-                text=True, 
-                check=False
-            )
-            output = result.stdout.lower()
-            for line in output.split('\n'):
-                if ':1234' in line and 'established' in line:
-                    return True
-            return False
-        except:
-            return False
+        return connection_probe.connections()
+    except Exception:
+        return []
+
+# Bytes/s a client must sustain for the configured sample rate (8-bit I + Q)
+expected_stream_rate = 2048000 * 2
 
-# Get CPU temperature
-def get_cpu_temperature():
-    if platform.system() == 'Linux':
+# Follow the port and sample rate configured in rtl_tcp.service
+def refresh_streaming_port():
+    global expected_stream_rate
+    config = get_rtl_tcp_config()
+    try:
+        connection_probe.port = int(config["port"])
+    except (ValueError, KeyError):
+        connection_probe.port = 1234
+    try:
+        expected_stream_rate = int(parse_rtl_number(config["sample_rate"])) * 2
+    except (ValueError, KeyError):
+        expected_stream_rate = 2048000 * 2
+    # The backlog monitor infers drops from the depth reaching -n + 2
+    backlog_monitor.stream_rate = expected_stream_rate
+    try:
+        backlog_monitor.max_depth = int(config["max_buffers"] or RTL_DEFAULT_MAX_BUFFERS)
+    except (ValueError, KeyError):
+        backlog_monitor.max_depth = RTL_DEFAULT_MAX_BUFFERS
+
+# Temperature sensors discovered once at startup. Every thermal_zone*/temp and
+# hwmon*/temp*_input is opened a single time and later read with pread(), so a
+# reading costs one syscall per sensor and never forks.
+class SensorRegistry:
+    def __init__(self, thermal_root='/sys/class/thermal', hwmon_root='/sys/class/hwmon'):
+        self.thermal_root = thermal_root
+        self.hwmon_root = hwmon_root
+        self.sensors = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _natural_key(name):
+        return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+    
+    @staticmethod
+    def _read_text(path, default=""):
+        try:
+            with open(path, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return default
+    
+    def _open(self, sensor_id, label, path):
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+        except OSError:
+            return
+        self.sensors.append({"sensor": sensor_id, "label": label, "fd": fd})
+    
+    def discover(self):
+        self.close()
+        self.sensors = []
+        
+        # thermal_zone0 first so cpu_temp keeps pointing at the SoC on a Pi
+        try:
+            zones = sorted((d for d in os.listdir(self.thermal_root) if d.startswith('thermal_zone')),
+                           key=self._natural_key)
+        except OSError:
+            zones = []
+        for zone in zones:
+            zone_path = os.path.join(self.thermal_root, zone)
+            label = self._read_text(os.path.join(zone_path, 'type'), zone)
+            self._open(zone, label, os.path.join(zone_path, 'temp'))
+        
         try:
-            # For Raspberry Pi
-            if os.path.exists('/sys/class/thermal/thermal_zone0/temp'):
-                with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-                    temp = float(f.read()) / 1000.0
-                    return temp
-            # For general Linux
-            if os.path.exists('/sys/class/hwmon'):
-                for hwmon in os.listdir('/sys/class/hwmon'):
-                    hwmon_path = os.path.join('/sys/class/hwmon', hwmon)
-                    for subdir in os.listdir(hwmon_path):
-                        if subdir.startswith('temp') and subdir.endswith('_input'):
-                            with open(os.path.join(hwmon_path, subdir), 'r') as f:
-                                temp = float(f.read()) / 1000.0
-                                return temp
-            # Using sensors command
+            hwmons = sorted(os.listdir(self.hwmon_root), key=self._natural_key)
+        except OSError:
+            hwmons = []
+        for hwmon in hwmons:
+            hwmon_path = os.path.join(self.hwmon_root, hwmon)
+            chip = self._read_text(os.path.join(hwmon_path, 'name'), hwmon)
+            try:
+                inputs = sorted((f for f in os.listdir(hwmon_path)
+                                 if f.startswith('temp') and f.endswith('_input')), key=self._natural_key)
+            except OSError:
+                continue
+            for entry in inputs:
+                prefix = entry[:-len('_input')]
+                label = self._read_text(os.path.join(hwmon_path, prefix + '_label'), prefix)
+                self._open(f"{hwmon}/{prefix}", f"{chip} {label}", os.path.join(hwmon_path, entry))
+        return self.sensors
+    
+    def read_all(self):
+        with self._lock:
+            if self.sensors is None:
+                self.discover()
+            readings = []
+            for sensor in self.sensors:
+                try:
+                    value = int(os.pread(sensor["fd"], 32, 0)) / 1000.0
+                except (OSError, ValueError):
+                    continue
+                readings.append({"sensor": sensor["sensor"], "label": sensor["label"], "temp": value})
+            return readings
+    
+    def close(self):
+        for sensor in self.sensors or []:
             try:
-                result = subprocess.run(
-                    ["sensors"],
-                    capture_output=True, text=True, check=False
-                )
-                output = result.stdout
-                for line in output.split('\n'):
-                    if 'Core 0' in line or 'CPU Temp' in line or 'temp1' in line:
-                        parts = line.split('+')
-                        if len(parts) > 1:
-                            temp_part = parts[1].split('°')[0]
-                            return float(temp_part)
-            except:
+                os.close(sensor["fd"])
+            except OSError:
                 pass
-        except:
-            pass
-    return 0
+        self.sensors = None
+
+sensor_registry = SensorRegistry()
 
-# Get system statistics
-def get_system_stats():
-    global status
+# Get all temperature sensors
+def get_temperatures():
+    try:
+        return sensor_registry.read_all()
+    except Exception:
+        return []
+
+# Runs status collectors on one monotonic timeline. Every collector has its own
+# period and deadline; due times advance on a fixed grid (skipping missed slots)
+# so a slow collector can delay a pass but never shifts the others' schedule.
+# In idle mode collectors added with essential=True keep their period, those
+# with an idle_period slow down to it, and the rest pause.
+class CollectorScheduler:
+    def __init__(self):
+        self.collectors = {}
+        self.idle = False
+        self.generation = 0
+        self.completed_generation = 0
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pass_done = threading.Condition(self._lock)
+    
+    def add(self, name, func, period, deadline=None, essential=False, idle_period=None):
+        self.collectors[name] = {
+            "func": func,
+            "period": period,
+            "deadline": deadline if deadline is not None else period,
+            "essential": essential,
+            "idle_period": idle_period,
+            "next_due": 0,
+            "runs": 0,
+            "overruns": 0,
+            "last_duration": 0
+        }
+    
+    def _period(self, collector):
+        if collector["essential"] or not self.idle:
+            return collector["period"]
+        return collector["idle_period"]
+    
+    def _active(self):
+        return [c for c in self.collectors.values() if self._period(c) is not None]
+    
+    def set_idle(self, idle):
+        with self._lock:
+            if idle == self.idle:
+                return
+            self.idle = idle
+        if not idle:
+            self.wake()
+    
+    # Block until a pass that started after the last wake() has finished (or timeout)
+    def wait_for_full_pass(self, timeout):
+        with self._pass_done:
+            target = self.generation
+            self._pass_done.wait_for(lambda: self.completed_generation >= target, timeout)
     
+    # Make the named collectors (or all of them) due now and interrupt the sleep
+    def wake(self, *names):
+        with self._lock:
+            for name in names or self.collectors:
+                self.collectors[name]["next_due"] = 0
+            self.generation += 1
+        self._wake.set()
+    
+    def run_due(self):
+        ran = False
+        with self._lock:
+            generation = self.generation
+        for name, collector in self.collectors.items():
+            period = self._period(collector)
+            if period is None:
+                continue
+            now = time.monotonic()
+            due = collector["next_due"]
+            if now < due:
+                continue
+            try:
+                collector["func"]()
+            except Exception as e:
+                print(f"Collector {name} failed: {e}")
+            finished = time.monotonic()
+            collector["runs"] += 1
+            collector["last_duration"] = finished - now
+            # Lateness plus run time beyond the deadline counts as an overrun
+            if due and finished - due > collector["deadline"]:
+                collector["overruns"] += 1
+            with self._lock:
+                if collector["next_due"] == due:
+                    if due == 0:
+                        collector["next_due"] = finished + period
+                    else:
+                        collector["next_due"] = due + (int((finished - due) // period) + 1) * period
+            ran = True
+        with self._pass_done:
+            self.completed_generation = generation
+            self._pass_done.notify_all()
+        return ran
+    
+    def run_forever(self, on_pass=None):
+        while True:
+            if self.run_due() and on_pass:
+                on_pass()
+            with self._lock:
+                next_due = min(c["next_due"] for c in self._active())
+            timeout = next_due - time.monotonic()
+            if timeout > 0 and self._wake.wait(timeout):
+                self._wake.clear()
+    
+    def stats(self):
+        return {
+            name: {
+                "period": c["period"],
+                "deadline": c["deadline"],
+                "idle_period": c["idle_period"],
+                "paused": self._period(c) is None,
+                "runs": c["runs"],
+                "overruns": c["overruns"],
+                "last_duration_ms": round(c["last_duration"] * 1000, 3)
+            }
+            for name, c in self.collectors.items()
+        }
+
+scheduler = CollectorScheduler()
+
+# Turns monotonically increasing byte counters into EWMA-smoothed rates (bytes/s).
+# Timestamps come from the monotonic clock, so late samples do not skew the rate.
+class RateMeter:
+    def __init__(self, time_constant=3.0):
+        self.time_constant = time_constant
+        self.rates = {}
+        self._last = {}
+    
+    def update(self, key, counter, now=None):
+        now = time.monotonic() if now is None else now
+        last = self._last.get(key)
+        self._last[key] = (counter, now)
+        if last is None:
+            return self.rates.setdefault(key, 0.0)
+        
+        elapsed = now - last[1]
+        if elapsed <= 0:
+            return self.rates[key]
+        # A counter that went backwards was reset (new socket, interface re-created)
+        instant = max(0, counter - last[0]) / elapsed
+        alpha = 1 - math.exp(-elapsed / self.time_constant)
+        self.rates[key] += alpha * (instant - self.rates[key])
+        return self.rates[key]
+    
+    # Drop keys that no longer exist (closed sockets, removed interfaces)
+    def retain(self, keys):
+        for key in list(self._last):
+            if key not in keys:
+                del self._last[key]
+                self.rates.pop(key, None)
+
+network_rates = RateMeter()
+stream_rates = RateMeter()
+retrans_rates = RateMeter()
+
+# Drop to the essential collectors when no client has asked for anything for this long (s)
+IDLE_TIMEOUT = 60
+# While idle, history and the collectors it records keep sampling at this period (s)
+IDLE_HISTORY_PERIOD = 10.0
+last_client_access = time.monotonic()
+
+# Record dashboard/API activity; leaving idle mode refreshes everything before answering
+def note_client_access():
+    global last_client_access
+    last_client_access = time.monotonic()
+    if scheduler.idle:
+        scheduler.set_idle(False)
+        scheduler.wait_for_full_pass(timeout=0.5)
+
+def check_demand():
+    scheduler.set_idle(time.monotonic() - last_client_access > IDLE_TIMEOUT)
+
+# Service and streaming state (cached unit state + one sock_diag query)
+def collect_streaming():
+    status["service_running"] = service_tracker.is_active()
+    
+    connections = get_streaming_connections() if status["service_running"] else []
+    status["streaming_active"] = len(connections) > 0
+    update_stream_telemetry(connections)
+
+def collect_process():
+    status["rtl_tcp_pid"] = get_rtl_tcp_pid()
+
+def collect_cpu():
     status["cpu_usage"] = psutil.cpu_percent(interval=None)
+
+# Per-client telemetry from tcp_info: delivery rate (bytes_acked, or bytes_sent
+# on older kernels), RTT, retransmissions and queued bytes. queue_ms is how much
+# IQ time is sitting in the socket; a growing value means the link is the bottleneck.
+def get_client_telemetry(conn, now):
+    key = ("socket", conn["inode"])
+    client = {
+        "remote": conn["remote"],
+        "send_queue": conn["send_queue"],
+        "queue_ms": round(conn["send_queue"] * 1000 / expected_stream_rate, 1)
+    }
+    counter = conn.get("bytes_acked", conn.get("bytes_sent"))
+    if counter is not None:
+        client["rate"] = stream_rates.update(key, counter, now)
+        client["keeping_up"] = client["rate"] >= 0.95 * expected_stream_rate
+    if "rtt" in conn:
+        client["rtt_ms"] = conn["rtt"] / 1000.0
+        client["rttvar_ms"] = conn["rttvar"] / 1000.0
+    if "total_retrans" in conn:
+        client["retransmits"] = conn["total_retrans"]
+        client["retrans_rate"] = retrans_rates.update(key, conn["total_retrans"], now)
+    if "notsent_bytes" in conn:
+        client["unsent_bytes"] = conn["notsent_bytes"]
+    if "delivery_rate" in conn:
+        client["delivery_rate"] = conn["delivery_rate"]
+    return client
+
+def update_stream_telemetry(connections):
+    now = time.monotonic()
+    clients = [get_client_telemetry(conn, now) for conn in connections]
+    keys = {("socket", conn["inode"]) for conn in connections}
+    retrans_rates.retain(keys)
+    
+    if clients and all("rate" in client for client in clients):
+        stream_rates.retain(keys)
+        sent_rate = sum(client["rate"] for client in clients)
+    else:
+        # No tcp_info (procfs fallback): use everything the rtl_tcp process wrote
+        sent_rate = 0.0
+        process = process_tracker.process if clients else None
+        try:
+            key = ("process", process.pid)
+            sent_rate = stream_rates.update(key, process.io_counters().write_chars, now)
+            stream_rates.retain({key})
+        except (AttributeError, psutil.Error):
+            stream_rates.retain(set())
     
-    status["cpu_temp"] = get_cpu_temperature()
+    status["stream_sent_rate"] = sent_rate
+    status["streaming_clients"] = clients
+    status["stream_rtt_ms"] = max((c.get("rtt_ms", 0) for c in clients), default=0)
+    status["stream_send_queue"] = sum(c["send_queue"] for c in clients)
+    status["stream_unsent_bytes"] = sum(c.get("unsent_bytes", 0) for c in clients)
+    status["stream_retrans_rate"] = sum(c.get("retrans_rate", 0) for c in clients)
+
+def collect_network():
+    now = time.monotonic()
+    counters = psutil.net_io_counters(pernic=True)
+    interfaces = {}
+    for name, io in counters.items():
+        interfaces[name] = {
+            "sent_rate": network_rates.update((name, "sent"), io.bytes_sent, now),
+            "recv_rate": network_rates.update((name, "recv"), io.bytes_recv, now)
+        }
+    network_rates.retain({(name, d) for name in counters for d in ("sent", "recv")})
     
+    status["network_sent"] = sum(io.bytes_sent for io in counters.values())
+    status["network_recv"] = sum(io.bytes_recv for io in counters.values())
+    status["network_sent_rate"] = sum(i["sent_rate"] for i in interfaces.values())
+    status["network_recv_rate"] = sum(i["recv_rate"] for i in interfaces.values())
+    status["network_interfaces"] = interfaces
+
+def collect_temperature():
+    temperatures = get_temperatures()
+    status["temperatures"] = temperatures
+    status["cpu_temp"] = temperatures[0]["temp"] if temperatures else 0
+
+def collect_memory():
     mem = psutil.virtual_memory()
     status["memory_total"] = mem.total
     status["memory_available"] = mem.available
@@ -136,35 +853,830 @@ def get_system_stats():
     status["swap_total"] = swap.total
     status["swap_free"] = swap.free
     status["swap_percent"] = swap.percent
+
+# rtl_tcp prints "ll+, now N" / "ll-, now N" each time its list of sample
+# buffers waiting for the TCP client grows or shrinks, so N is the backlog
+# depth in buffers. A depth that stays high means the client is falling behind.
+# Drops are not logged: once -n + 2 buffers are queued behind the head rtl_tcp
+# frees the oldest one for every new one, so the reported depth stops at -n + 2
+# and nothing is printed. A drop period is therefore inferred from the depth
+# reaching -n + 2 for the -n configured in the unit, and the samples lost in it are
+# estimated from its length and the stream rate. When the client goes away
+# rtl_tcp frees the list without an ll line, so "client accepted!" / "all
+# threads dead.." (or the collector seeing no client) empty it here too. The
+# monitor is fed from the journal follower.
+BACKLOG_PATTERN = re.compile(r'll([+-]), now (\d+)')
+CLIENT_PATTERN = re.compile(r'client accepted!|all threads dead')
+BACKLOG_WARN_DEPTH = 8      # buffers (~0.5 s of IQ at 2 MS/s)
+BACKLOG_SUSTAINED = 3.0     # seconds at or above BACKLOG_WARN_DEPTH (or the cap, if lower)
+
+class BacklogMonitor:
+    def __init__(self, warn_depth=BACKLOG_WARN_DEPTH, sustained=BACKLOG_SUSTAINED,
+                 max_depth=500, stream_rate=2048000 * 2):
+        self.warn_depth = warn_depth
+        self.sustained = sustained
+        # rtl_tcp's -n (0 = unbounded, never drops) and the IQ rate in bytes/s
+        self.max_depth = max_depth
+        self.stream_rate = stream_rate
+        self.depth = 0
+        self.peak = 0
+        self.drops = 0
+        self.dropped_bytes = 0
+        self.pid = None
+        self.above_since = None
+        self.capped_since = None
+        self.started = time.time()
+        self._lock = threading.Lock()
     
-    status["rtl_tcp_pid"] = get_rtl_tcp_pid()
+    def _set_depth(self, depth, when):
+        self.depth = depth
+        warn_depth = min(self.warn_depth, self.max_depth + 2) if self.max_depth else self.warn_depth
+        if depth < warn_depth:
+            self.above_since = None
+        elif self.above_since is None:
+            self.above_since = when
+        
+        # Drop periods count from startup (lines replayed from before only set the depth)
+        capped = self.max_depth and depth >= self.max_depth + 2
+        if capped and self.capped_since is None:
+            if when >= self.started:
+                self.drops += 1
+            self.capped_since = max(when, self.started)
+        elif not capped and self.capped_since is not None:
+            self.dropped_bytes += int(max(0, when - self.capped_since) * self.stream_rate)
+            self.capped_since = None
+    
+    # Journal follower listener
+    def handle(self, entry):
+        backlog = BACKLOG_PATTERN.search(entry["message"])
+        if not backlog and not CLIENT_PATTERN.search(entry["message"]):
+            return
+        
+        with self._lock:
+            # A new rtl_tcp process starts with an empty list
+            if entry["pid"] != self.pid:
+                self.pid = entry["pid"]
+                self._set_depth(0, entry["time"])
+            # A client connecting or leaving starts over with an empty list
+            self._set_depth(int(backlog.group(2)) if backlog else 0, entry["time"])
+            if entry["time"] >= self.started:
+                self.peak = max(self.peak, self.depth)
+    
+    def reset(self):
+        with self._lock:
+            self._set_depth(0, time.time())
+    
+    def is_sustained(self, now):
+        return self.above_since is not None and now - self.above_since >= self.sustained
+    
+    def is_dropping(self):
+        return self.capped_since is not None
+    
+    # Estimated bytes lost at the cap, including the drop period still running
+    def estimated_dropped_bytes(self, now):
+        with self._lock:
+            running = max(0, now - self.capped_since) if self.capped_since is not None else 0
+            return self.dropped_bytes + int(running * self.stream_rate)
+
+backlog_monitor = BacklogMonitor()
+drop_rates = RateMeter(time_constant=60.0)
+
+def collect_backlog():
+    # Nothing is queued without a client, even if no line said so
+    if not status["service_running"] or not status["streaming_active"]:
+        backlog_monitor.reset()
+    
+    status["stream_backlog"] = backlog_monitor.depth
+    status["stream_backlog_peak"] = backlog_monitor.peak
+    now = time.time()
+    status["stream_drops"] = backlog_monitor.drops
+    status["stream_dropping"] = backlog_monitor.is_dropping()
+    status["stream_dropped_bytes"] = backlog_monitor.estimated_dropped_bytes(now)
+    # Drop periods per minute
+    status["stream_drop_rate"] = round(drop_rates.update("drops", backlog_monitor.drops) * 60, 2)
+    status["stream_backlog_sustained"] = backlog_monitor.is_sustained(now)
+
+# Optional IQ relay (--relay-port): holds the single upstream connection to
+# rtl_tcp and fans the stream out to any number of downstream clients. Upstream
+# chunks go into a ring of immutable bytes objects; every client has its own
+# read cursor (a chunk sequence number) and a sender thread that writes the
+# shared chunk objects, so data is received once and never copied per client.
+# The upstream reader never waits for a client, and each client may lag at most
+# --relay-max-lag ms of IQ (its kernel send buffer is sized to match). Sends
+# time out after RELAY_SEND_TIMEOUT (SO_SNDTIMEO), so a client that stops
+# reading is still checked several times a second. A client beyond the bound is
+# handled by the slow-consumer policy: "drop_oldest" skips ahead to the newest
+# data within the bound, "decimate" skips every other chunk once it is past half
+# the bound (short gaps instead of one jump) and jumps like drop_oldest if it
+# still reaches the bound, "disconnect" closes it. So one slow client can neither
+# stall the dongle nor grow memory past the ring plus its bounded socket buffer.
+# The cached 12-byte RTL0 header is replayed to each client on connect. Upstream
+# is connected while at least one client is, so rtl_tcp is free (and retunable)
+# otherwise.
+# Control commands from clients are arbitrated by policy: "all" forwards
+# everyone's, "first" only the longest-connected client's, "none" nobody's.
+RELAY_CHUNK_BYTES = 65536
+RELAY_CONTROL_POLICIES = ("all", "first", "none")
+RELAY_SLOW_POLICIES = ("drop_oldest", "decimate", "disconnect")
+RELAY_SEND_TIMEOUT = 0.1    # s a send may block before the lag is checked again
+
+# Where rtl_tcp accepts connections on this machine
+def rtl_tcp_endpoint(config=None):
+    config = config or get_rtl_tcp_config()
+    host = config["address"] if config["address"] not in ("0.0.0.0", "::") else "127.0.0.1"
+    return host, int(config["port"])
+
+class RelayClient:
+    def __init__(self, client_id, sock, remote, cursor, offset):
+        self.id = client_id
+        self.sock = sock
+        self.remote = remote
+        # Next chunk to send and its byte offset in the upstream stream
+        self.cursor = cursor
+        self.offset = offset
+        # Unsent rest of the chunk being written (already counted in offset)
+        self.pending = None
+        self.connected = time.time()
+        self.open = True
+        self.sent_bytes = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.commands = 0
+        self.ignored_commands = 0
+
+class IQRelay:
+    def __init__(self, slots=128, control="first", policy="drop_oldest", max_lag_ms=500):
+        self.slots = slots
+        self.control = control
+        self.policy = policy
+        self.max_lag_ms = max_lag_ms
+        self.host = None
+        self.port = None
+        self.enabled = False
+        self.header = None
+        self.upstream = None
+        self.upstream_bytes = 0
+        self.clients = []
+        self.ring = [None] * slots
+        self.starts = [0] * slots
+        self.seq = 0
+        self.total = 0
+        self.disconnected_slow = 0
+        self.changed = threading.Condition()
+        self._upstream_lock = threading.Lock()
+        self._next_id = 1
+    
+    def start(self, host, port, slots=None, control=None, policy=None, max_lag_ms=None):
+        if slots:
+            self.slots = slots
+            self.ring = [None] * slots
+            self.starts = [0] * slots
+        if control:
+            self.control = control
+        if policy:
+            self.policy = policy
+        if max_lag_ms:
+            self.max_lag_ms = max_lag_ms
+        self.host, self.port = host, port
+        listener = socket.create_server((host, port), backlog=16)
+        self.enabled = True
+        threading.Thread(target=self._accept_loop, args=(listener,), daemon=True).start()
+        return self
+    
+    @property
+    def connected(self):
+        return self.upstream is not None
+    
+    def _accept_loop(self, listener):
+        while True:
+            sock, address = listener.accept()
+            threading.Thread(target=self._serve_client, args=(sock, address), daemon=True).start()
+    
+    def _connect_upstream(self):
+        with self._upstream_lock:
+            if self.upstream is not None:
+                return True
+            try:
+                sock = socket.create_connection(rtl_tcp_endpoint(), timeout=5)
+                header = b''
+                while len(header) < RTL_TCP_HEADER.size:
+                    chunk = sock.recv(RTL_TCP_HEADER.size - len(header))
+                    if not chunk:
+                        raise ConnectionError("rtl_tcp closed the connection")
+                    header += chunk
+                if header[:4] != RTL_TCP_MAGIC:
+                    raise ConnectionError(f"Not an rtl_tcp server (header {header[:4]!r})")
+                sock.settimeout(None)
+            except (OSError, ValueError) as e:
+                print(f"Relay: cannot connect to rtl_tcp: {e}")
+                return False
+            self.header = header
+            self.upstream = sock
+            threading.Thread(target=self._upstream_loop, args=(sock,), daemon=True).start()
+            return True
+    
+    def _upstream_loop(self, sock):
+        carry = b''
+        try:
+            while True:
+                with self.changed:
+                    if not self.clients:
+                        break
+                data = sock.recv(RELAY_CHUNK_BYTES)
+                if not data:
+                    break
+                self.upstream_bytes += len(data)
+                # Keep chunks a whole number of I/Q pairs so late joiners stay aligned
+                data = carry + data
+                if len(data) % 2:
+                    data, carry = data[:-1], data[-1:]
+                else:
+                    carry = b''
+                with self.changed:
+                    slot = self.seq % self.slots
+                    self.ring[slot] = data
+                    self.starts[slot] = self.total
+                    self.total += len(data)
+                    self.seq += 1
+                    self.changed.notify_all()
+        except OSError:
+            pass
+        finally:
+            with self._upstream_lock:
+                self.upstream = None
+                sock.close()
+            # Clients cannot continue without upstream; they reconnect
+            with self.changed:
+                for client in self.clients:
+                    client.open = False
+                self.changed.notify_all()
     
-    net_io = psutil.net_io_counters()
-    status["network_sent"] = net_io.bytes_sent
-    status["network_recv"] = net_io.bytes_recv
+    # Most IQ bytes a client may be behind
+    def lag_limit(self):
+        return max(RELAY_CHUNK_BYTES, expected_stream_rate * self.max_lag_ms / 1000)
     
-    status["update_time"] = time.time()
+    # Called with self.changed held
+    def _drop_client(self, client):
+        client.open = False
+        self.disconnected_slow += 1
+        try:
+            client.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    
+    # IQ bytes received upstream but not yet handed to the client's socket
+    def _lag(self, client):
+        return self.total - client.offset + (len(client.pending) if client.pending else 0)
+    
+    # Called with self.changed held; moves the cursor to chunk seq, counting what is skipped
+    def _skip_to(self, client, seq):
+        offset = self.starts[seq % self.slots] if seq < self.seq else self.total
+        client.dropped_chunks += seq - client.cursor
+        client.dropped_bytes += offset - client.offset
+        client.cursor = seq
+        client.offset = offset
+    
+    # Called with self.changed held; applies the slow-consumer policy. Returns
+    # False when the client has been disconnected.
+    def _enforce_lag(self, client):
+        # Chunks already overwritten are gone whatever the policy
+        if self.seq - client.cursor > self.slots:
+            self._skip_to(client, self.seq - self.slots)
+        
+        limit = self.lag_limit()
+        # Decimation drops whole chunks, so only between chunks
+        if self.policy == "decimate" and not client.pending and client.cursor < self.seq and \
+                self._lag(client) > limit / 2:
+            self._skip_to(client, client.cursor + 1)
+        if self._lag(client) <= limit:
+            return True
+        if self.policy == "disconnect":
+            self._drop_client(client)
+            return False
+        
+        # Drop the oldest data: the unsent rest of the current chunk (when it
+        # ends on an I/Q pair boundary), then whole chunks up to the bound
+        if client.pending and len(client.pending) % 2 == 0:
+            client.dropped_bytes += len(client.pending)
+            client.pending = None
+        seq = client.cursor
+        while seq < self.seq and self.total - self.starts[seq % self.slots] > limit:
+            seq += 1
+        self._skip_to(client, seq)
+        return True
+    
+    def _serve_client(self, sock, address):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # The kernel doubles this, so socket buffer plus ring lag stay near 2x the bound
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, int(self.lag_limit() // 2))
+        # Blocking sends give up after this, so the sender can apply the lag policy
+        seconds = int(RELAY_SEND_TIMEOUT)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO,
+                        struct.pack('ll', seconds, int((RELAY_SEND_TIMEOUT - seconds) * 1e6)))
+        with self.changed:
+            client = RelayClient(self._next_id, sock, f"{address[0]}:{address[1]}", self.seq, self.total)
+            self._next_id += 1
+            self.clients.append(client)
+        try:
+            if not self._connect_upstream():
+                return
+            with self.changed:
+                client.cursor, client.offset = self.seq, self.total
+            sock.sendall(self.header)
+            threading.Thread(target=self._read_commands, args=(client,), daemon=True).start()
+            self._send_loop(client)
+        except OSError:
+            pass
+        finally:
+            with self.changed:
+                client.open = False
+                if client in self.clients:
+                    self.clients.remove(client)
+                self.changed.notify_all()
+            sock.close()
+    
+    def _send_loop(self, client):
+        while True:
+            with self.changed:
+                while client.open and not client.pending and client.cursor >= self.seq:
+                    self.changed.wait()
+                if not client.open or not self._enforce_lag(client):
+                    return
+                if not client.pending:
+                    if client.cursor >= self.seq:
+                        continue
+                    chunk = self.ring[client.cursor % self.slots]
+                    client.cursor += 1
+                    client.offset += len(chunk)
+                    client.pending = memoryview(chunk)
+                pending = client.pending
+            
+            try:
+                sent = client.sock.send(pending)
+            except BlockingIOError:
+                # SO_SNDTIMEO expired: the client is not reading
+                continue
+            client.sent_bytes += sent
+            with self.changed:
+                client.pending = pending[sent:] if sent < len(pending) else None
+    
+    def _read_commands(self, client):
+        buffer = b''
+        try:
+            while client.open:
+                data = client.sock.recv(64)
+                if not data:
+                    break
+                buffer += data
+                while len(buffer) >= RTL_TCP_COMMAND.size:
+                    command, buffer = buffer[:RTL_TCP_COMMAND.size], buffer[RTL_TCP_COMMAND.size:]
+                    client.commands += 1
+                    if self._may_control(client):
+                        self._send_upstream(command)
+                    else:
+                        client.ignored_commands += 1
+        except OSError:
+            pass
+        finally:
+            with self.changed:
+                client.open = False
+                self.changed.notify_all()
+    
+    def _may_control(self, client):
+        if self.control == "all":
+            return True
+        if self.control == "first":
+            with self.changed:
+                return bool(self.clients) and self.clients[0] is client
+        return False
+    
+    def _send_upstream(self, command):
+        with self._upstream_lock:
+            if self.upstream is None:
+                return False
+            self.upstream.sendall(command)
+            return True
+    
+    # Used by the monitor itself (live apply), regardless of the client policy
+    def send_commands(self, commands):
+        for code, value in commands:
+            if not self._send_upstream(RTL_TCP_COMMAND.pack(code, int(value) & 0xffffffff)):
+                raise ConnectionError("Relay is not connected to rtl_tcp")
+    
+    def stats(self, now):
+        with self.changed:
+            clients = list(self.clients)
+            lags = {client.id: self._lag(client) for client in clients}
+        controller = clients[0] if clients else None
+        rates = {}
+        for client in clients:
+            rates[client.id] = relay_rates.update(client.id, client.sent_bytes, now)
+        relay_rates.retain(set(rates) | {"upstream"})
+        return {
+            "port": self.port,
+            "control": self.control,
+            "policy": self.policy,
+            "max_lag_ms": self.max_lag_ms,
+            "disconnected_slow": self.disconnected_slow,
+            "upstream_connected": self.connected,
+            "upstream_rate": relay_rates.update("upstream", self.upstream_bytes, now),
+            "rate": sum(rates.values()),
+            "clients": [{
+                "id": client.id,
+                "remote": client.remote,
+                "rate": rates[client.id],
+                "sent_bytes": client.sent_bytes,
+                "lag_bytes": lags[client.id],
+                "lag_ms": round(lags[client.id] * 1000 / expected_stream_rate, 1),
+                "dropped_chunks": client.dropped_chunks,
+                "dropped_bytes": client.dropped_bytes,
+                "commands": client.commands,
+                "ignored_commands": client.ignored_commands,
+                "controls": self.control == "all" or (self.control == "first" and client is controller)
+            } for client in clients]
+        }
 
+iq_relay = IQRelay()
+relay_rates = RateMeter()
+
+def collect_relay():
+    if iq_relay.enabled:
+        status["relay"] = iq_relay.stats(time.monotonic())
+
+# Status history: one preallocated array per numeric field, written as a ring.
+# 'd' is used for byte counters, 'f' (4 bytes) for everything else; with the
+# defaults below this is about 11.1 MB for 24 h of 1 s samples, fixed at startup.
+HISTORY_SECONDS = 24 * 3600
+HISTORY_FIELDS = [
+    ("service_running", 'f'),
+    ("streaming_active", 'f'),
+    ("cpu_usage", 'f'),
+    ("cpu_temp", 'f'),
+    ("memory_total", 'd'),
+    ("memory_available", 'd'),
+    ("memory_percent", 'f'),
+    ("swap_total", 'd'),
+    ("swap_free", 'd'),
+    ("swap_percent", 'f'),
+    ("network_sent", 'd'),
+    ("network_recv", 'd'),
+    ("network_sent_rate", 'f'),
+    ("network_recv_rate", 'f'),
+    ("stream_sent_rate", 'f'),
+    ("stream_rtt_ms", 'f'),
+    ("stream_send_queue", 'f'),
+    ("stream_unsent_bytes", 'f'),
+    ("stream_retrans_rate", 'f'),
+    ("stream_backlog", 'f'),
+    ("stream_backlog_peak", 'f'),
+    ("stream_drops", 'f'),
+    ("stream_drop_rate", 'f'),
+    ("rtl_tcp_pid", 'f')
+]
+
+class StatusHistory:
+    def __init__(self, fields, capacity):
+        self.capacity = capacity
+        self.times = array('d', [0.0]) * capacity
+        self.columns = {name: array(typecode, [math.nan]) * capacity for name, typecode in fields}
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def memory_bytes(self):
+        return self.times.itemsize * self.capacity + \
+            sum(column.itemsize * self.capacity for column in self.columns.values())
+    
+    def append(self, timestamp, sample):
+        with self._lock:
+            index = self.count % self.capacity
+            # Keep timestamps ordered even if the wall clock steps back (no RTC on a Pi)
+            if self.count:
+                timestamp = max(timestamp, self.times[(self.count - 1) % self.capacity])
+            self.times[index] = timestamp
+            for name, column in self.columns.items():
+                value = sample.get(name)
+                column[index] = math.nan if value is None else float(value)
+            self.count += 1
+    
+    # First logical position whose timestamp is >= timestamp
+    def _bisect(self, timestamp):
+        lo = max(0, self.count - self.capacity)
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[mid % self.capacity] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    # Average samples into step-second buckets; returns [[bucket_start, mean or None], ...]
+    def query(self, field, start, end, step):
+        column = self.columns[field]
+        points = []
+        with self._lock:
+            position = self._bisect(start)
+            stop = self._bisect(end)
+            bucket = None
+            total = 0.0
+            samples = 0
+            while position < stop:
+                index = position % self.capacity
+                key = int((self.times[index] - start) // step)
+                if key != bucket:
+                    if bucket is not None:
+                        points.append([start + bucket * step, total / samples if samples else None])
+                    bucket, total, samples = key, 0.0, 0
+                value = column[index]
+                if value == value:
+                    total += value
+                    samples += 1
+                position += 1
+            if bucket is not None:
+                points.append([start + bucket * step, total / samples if samples else None])
+        return points
+
+history = StatusHistory(HISTORY_FIELDS, HISTORY_SECONDS)
+
+def collect_history():
+    history.append(time.time(), status)
+
+# name, collector, period (s), deadline (s); essential collectors also run at full
+# rate while idle, and history plus its inputs continue at IDLE_HISTORY_PERIOD
+scheduler.add("demand", check_demand, 1.0, 0.5, essential=True)
+scheduler.add("streaming", collect_streaming, 0.25, 0.1, essential=True)
+scheduler.add("process", collect_process, 1.0, 0.5, idle_period=IDLE_HISTORY_PERIOD)
+scheduler.add("cpu", collect_cpu, 1.0, 0.5, idle_period=IDLE_HISTORY_PERIOD)
+scheduler.add("network", collect_network, 1.0, 0.5, idle_period=IDLE_HISTORY_PERIOD)
+scheduler.add("temperature", collect_temperature, 5.0, 1.0, idle_period=IDLE_HISTORY_PERIOD)
+scheduler.add("memory", collect_memory, 30.0, 5.0, idle_period=30.0)
+scheduler.add("backlog", collect_backlog, 1.0, 0.5, essential=True)
+scheduler.add("relay", collect_relay, 1.0, 0.5)
+scheduler.add("history", collect_history, 1.0, 0.5, idle_period=IDLE_HISTORY_PERIOD)
+
+# One published status tick: the data, its pre-encoded JSON, a version and an
+# ETag. Instances are immutable and are published by swapping one reference, so
+# readers never see a half-updated tick and never re-serialize it.
+class StatusSnapshot:
+    __slots__ = ("version", "data", "body", "etag")
+    
+    def __init__(self, version, data):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "body", json.dumps(data, separators=(',', ':')).encode())
+        object.__setattr__(self, "etag", f"{SNAPSHOT_EPOCH}-{version}")
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("StatusSnapshot is immutable")
+
+# Distinguishes versions of this process from those of a previous run
+SNAPSHOT_EPOCH = os.urandom(4).hex()
+current_snapshot = StatusSnapshot(0, dict(status))
+snapshot_published = threading.Condition()
+
+# Recently published snapshots by version, to answer "what changed since N"
+DELTA_WINDOW = 120
+recent_snapshots = {0: current_snapshot}
+
+# Publish the collectors' working copy if anything changed since the last tick.
+# Collectors replace nested values (lists, dicts) instead of mutating them, so a
+# shallow copy is a consistent snapshot.
+def publish_status():
+    global current_snapshot
+    previous = current_snapshot
+    data = dict(status)
+    data["update_time"] = previous.data["update_time"]
+    if data == previous.data:
+        return previous
+    
+    data["update_time"] = status["update_time"] = time.time()
+    snapshot = StatusSnapshot(previous.version + 1, data)
+    with snapshot_published:
+        recent_snapshots[snapshot.version] = snapshot
+        recent_snapshots.pop(snapshot.version - DELTA_WINDOW, None)
+        current_snapshot = snapshot
+        snapshot_published.notify_all()
+    return snapshot
+
+# Block until a snapshot newer than version is published (or timeout); returns the current one
+def wait_for_snapshot(version, timeout):
+    with snapshot_published:
+        snapshot_published.wait_for(lambda: current_snapshot.version > version, timeout)
+        return current_snapshot
+
+# Fields whose values differ between two snapshots
+def snapshot_delta(old, new):
+    return {key: value for key, value in new.data.items() if old.data.get(key) != value}
+
+# Version number behind a tag ("<epoch>-<n>", as in the ETag) or a plain number;
+# -1 (anything is newer) for tags from another process run or garbage
+def parse_version(tag):
+    epoch, _, version = (tag or "").strip().strip('"').rpartition('-')
+    if epoch and epoch != SNAPSHOT_EPOCH:
+        return -1
+    try:
+        return int(version)
+    except ValueError:
+        return -1
+
+# Look up a snapshot by the version a client holds; None outside the window
+def find_snapshot(tag):
+    return recent_snapshots.get(parse_version(tag))
+
+# Versioned status update as JSON bytes: a patch against base when the client's
+# version is known, otherwise a full resync
+def encode_status_update(base, snapshot):
+    if base is None:
+        return b'{"version":"%s","full":true,"data":' % snapshot.etag.encode() + snapshot.body + b'}'
+    return json.dumps({
+        "version": snapshot.etag,
+        "base": base.etag,
+        "full": False,
+        "changes": snapshot_delta(base, snapshot)
+    }, separators=(',', ':')).encode()
+
+# Update status in background
 def update_status_loop():
-    global status
+    refresh_streaming_port()
+    # Follow -p/-s/-n edits made outside the monitor too
+    unit_file.add_listener(refresh_streaming_port)
+    
+    # React to unit state changes immediately instead of on the next 250 ms slot
+    service_tracker.add_listener(lambda: scheduler.wake("streaming"))
     
-    last_network_sent = 0
-    last_network_recv = 0
-    last_update_time = time.time()
+    scheduler.run_forever(publish_status)
+
+# Service operations (start/stop/restart, config apply) run as jobs on one
+# dedicated worker so a slow daemon-reload/restart never holds an HTTP thread.
+# A request for an action that is already queued or running with the same
+# arguments joins that job. Job state is published through the status stream.
+class JobManager:
+    def __init__(self, keep=20):
+        self.keep = keep
+        self.jobs = {}
+        self._active = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job')
+        self._listeners = []
+        # Timings of the last configuration apply, set by the job and published by collect_jobs
+        self.last_apply = None
     
-    while True:
-        status["service_running"] = is_service_running("rtl_tcp.service")
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+    
+    def _notify(self):
+        for callback in self._listeners:
+            callback()
+    
+    # Returns (job, created); created is False when joined to an existing job.
+    # args must be JSON-serializable (they form the coalescing key).
+    def submit(self, action, func, *args):
+        key = (action, json.dumps(args, sort_keys=True))
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None:
+                return dict(job), False
+            
+            job = {
+                "id": str(self._next_id),
+                "action": action,
+                "state": "queued",
+                "step": "",
+                "message": "",
+                "created": time.time(),
+                "finished": None
+            }
+            self._next_id += 1
+            self.jobs[job["id"]] = job
+            self._active[key] = job
+            finished = [j for j in self.jobs.values() if j["finished"]]
+            for old in finished[:max(0, len(self.jobs) - self.keep)]:
+                del self.jobs[old["id"]]
         
-        status["streaming_active"] = False
-        if status["service_running"]:
-            status["streaming_active"] = check_streaming_connections()
+        self._executor.submit(self._run, key, job, func, args)
+        self._notify()
+        return dict(job), True
+    
+    def _run(self, key, job, func, args):
+        self._local.job = job
+        with self._lock:
+            job["state"] = "running"
+        self._notify()
+        try:
+            success, message = func(*args)
+        except Exception as e:
+            success, message = False, str(e)
+        with self._lock:
+            job["state"] = "succeeded" if success else "failed"
+            job["message"] = message
+            job["step"] = ""
+            job["finished"] = time.time()
+            self._active.pop(key, None)
+        self._local.job = None
+        self._notify()
+    
+    # Called from inside a job to report what it is doing
+    def progress(self, step):
+        job = getattr(self._local, "job", None)
+        if job is not None:
+            with self._lock:
+                job["step"] = step
+            self._notify()
+    
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+    
+    def summary(self):
+        with self._lock:
+            return [dict(job) for job in self.jobs.values()]
+
+job_manager = JobManager()
+
+def collect_jobs():
+    status["jobs"] = job_manager.summary()
+    status["config_apply"] = job_manager.last_apply
+
+scheduler.add("jobs", collect_jobs, 1.0, 0.5)
+job_manager.add_listener(lambda: scheduler.wake("jobs"))
+
+# Run "sudo systemctl <action> rtl_tcp.service"
+def control_service(action):
+    result = subprocess.run(
+        ["sudo", "systemctl", action, "rtl_tcp.service"],
+        capture_output=True, text=True, check=False
+    )
+    service_status_cache.invalidate()
+    if result.returncode == 0:
+        return True, f"Service {action} completed"
+    return False, result.stderr
+
+# Cache in front of an expensive call: results are reused for ttl seconds,
+# and concurrent callers for the same key wait for the one refresh in flight
+# instead of each running it. invalidate() bumps a generation so a refresh
+# that started before the invalidation is not stored as fresh.
+class TTLCache:
+    def __init__(self, func, ttl):
+        self.func = func
+        self.ttl = ttl
+        self.entries = {}
+        self.inflight = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def get(self, *key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == self.generation and time.monotonic() - entry[1] < self.ttl:
+                self.hits += 1
+                return entry[2]
+            
+            waiter = self.inflight.get(key)
+            if waiter is None:
+                waiter = self.inflight[key] = threading.Event()
+                waiter.generation = self.generation
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.hits += 1
         
-        get_system_stats()
+        if not leader:
+            waiter.wait()
+            if waiter.error is not None:
+                raise waiter.error
+            return waiter.value
         
-        time.sleep(1)
+        waiter.value = waiter.error = None
+        try:
+            waiter.value = self.func(*key)
+        except Exception as e:
+            waiter.error = e
+        with self._lock:
+            if waiter.error is None and waiter.generation == self.generation:
+                self.entries[key] = (waiter.generation, time.monotonic(), waiter.value)
+            del self.inflight[key]
+        waiter.set()
+        if waiter.error is not None:
+            raise waiter.error
+        return waiter.value
+    
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self.entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {"ttl": self.ttl, "hits": self.hits, "misses": self.misses}
 
-# Get systemctl status
-def get_service_status(service_name="rtl_tcp.service"):
+# Run systemctl status (uncached, use get_service_status)
+def query_service_status(service_name):
     try:
         result = subprocess.run(
             ["sudo", "systemctl", "status", service_name],
@@ -174,136 +1686,729 @@ def get_service_status(service_name="rtl_tcp.service"):
     except Exception as e:
         return f"Error: {str(e)}"
 
+# "systemctl status" forks sudo and reads the journal; every open dashboard asks
+# for it, so share one result between them for a few seconds
+service_status_cache = TTLCache(query_service_status, 5.0)
+service_tracker.add_listener(service_status_cache.invalidate)
+
+# Get systemctl status
+def get_service_status(service_name="rtl_tcp.service"):
+    return service_status_cache.get(service_name)
+
+# One long-lived "journalctl -f -o json" reader for the rtl_tcp unit. Lines go
+# into a bounded ring buffer, each with an increasing sequence number that
+# clients use as a cursor (/api/logs?after=<seq>) to fetch only new lines.
+# If journalctl exits it is restarted from the last journal cursor, so no
+# lines are repeated or lost.
+class JournalFollower:
+    def __init__(self, unit="rtl_tcp.service", size=1000, backlog=200, retry_interval=5.0):
+        self.unit = unit
+        self.backlog = backlog
+        self.retry_interval = retry_interval
+        self.entries = deque(maxlen=size)
+        self.last_seq = 0
+        self.journal_cursor = None
+        self.running = False
+        self.error = None
+        self.changed = threading.Condition()
+        self._listeners = []
+        self._thread = None
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+    
+    # Called from the follower thread with each new entry
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+    
+    def _command(self):
+        command = ["sudo", "journalctl", "-u", self.unit, "-f", "-o", "json", "--no-pager"]
+        if self.journal_cursor:
+            command += ["--after-cursor", self.journal_cursor]
+        else:
+            command += ["-n", str(self.backlog)]
+        return command
+    
+    def _run(self):
+        while True:
+            try:
+                process = subprocess.Popen(self._command(), stdout=subprocess.PIPE,
+                                           stderr=subprocess.DEVNULL)
+            except OSError as e:
+                self.error = str(e)
+                time.sleep(self.retry_interval)
+                continue
+            
+            self.running, self.error = True, None
+            for line in process.stdout:
+                entry = self._parse(line)
+                if entry is not None:
+                    self._append(entry)
+            self.running = False
+            self.error = f"journalctl exited with status {process.wait()}"
+            time.sleep(self.retry_interval)
+    
+    def _parse(self, line):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        
+        # Non-UTF-8 messages come as a list of byte values
+        message = record.get("MESSAGE")
+        if isinstance(message, list):
+            message = bytes(message).decode('utf-8', 'replace')
+        self.journal_cursor = record.get("__CURSOR", self.journal_cursor)
+        return {
+            "time": int(record.get("__REALTIME_TIMESTAMP", 0)) / 1e6,
+            "priority": int(record.get("PRIORITY", 6)),
+            "pid": record.get("_PID"),
+            "message": message or ""
+        }
+    
+    def _append(self, entry):
+        with self.changed:
+            self.last_seq += 1
+            entry["seq"] = self.last_seq
+            self.entries.append(entry)
+            self.changed.notify_all()
+        for callback in self._listeners:
+            callback(entry)
+    
+    # Entries with seq > after (at most limit), and whether older ones were
+    # already dropped from the buffer. A cursor from the future (monitor
+    # restarted) reads from the start.
+    def read(self, after=0, limit=500, timeout=0):
+        with self.changed:
+            if after > self.last_seq:
+                after = 0
+            if timeout:
+                self.changed.wait_for(lambda: self.last_seq > after, timeout)
+            
+            first_seq = self.entries[0]["seq"] if self.entries else self.last_seq + 1
+            start = max(0, after + 1 - first_seq)
+            entries = list(islice(self.entries, start, start + limit))
+            return entries, after + 1 < first_seq
+    
+    def stats(self):
+        return {
+            "running": self.running,
+            "error": self.error,
+            "last_seq": self.last_seq,
+            "buffered": len(self.entries)
+        }
+
+journal_follower = JournalFollower()
+
+# Journal entries after a cursor plus the next cursor; the body of /api/logs and
+# of the "log" events on /api/events
+def read_log_update(after, limit, timeout=0):
+    entries, truncated = journal_follower.read(after, limit, timeout)
+    return {
+        "entries": entries,
+        "cursor": entries[-1]["seq"] if entries else min(after, journal_follower.last_seq),
+        "truncated": truncated,
+        "follower": journal_follower.stats()
+    }
+journal_follower.add_listener(backlog_monitor.handle)
+
+# rtl_tcp command line model. Tokens up to the rtl_tcp executable (or the first
+# option) are the program, which keeps interpreter prefixes such as
+# "python3 rtl_tcp_emulator.py". Options are kept as an ordered list of
+# [flag, value] pairs so unknown flags and stray tokens round-trip unchanged.
+RTL_TCP_OPTIONS = {
+    # key: (flag, value pattern); None means the flag takes no value
+    "address": ("-a", r'\S+'),
+    "port": ("-p", r'\d+'),
+    "frequency": ("-f", r'\d+(\.\d+)?[kMG]?'),
+    "gain": ("-g", r'-?\d+(\.\d+)?'),
+    "sample_rate": ("-s", r'\d+(\.\d+)?[kMG]?'),
+    "buffers": ("-b", r'\d+'),
+    "max_buffers": ("-n", r'\d+'),
+    "device": ("-d", r'\S+'),
+    "ppm": ("-P", r'-?\d+'),
+    "bias_tee": ("-T", None)
+}
+RTL_TCP_DEFAULTS = {"address": "0.0.0.0", "port": "1234", "sample_rate": "2048000"}
+RTL_TCP_FLAGS = {flag: pattern for flag, pattern in RTL_TCP_OPTIONS.values()}
+
+# rtl_tcp numbers accept a k/M/G suffix ("2.4M")
+def parse_rtl_number(text):
+    text = str(text).strip()
+    scale = {"k": 1e3, "M": 1e6, "G": 1e9}.get(text[-1:], 1)
+    return float(text[:-1] if scale != 1 else text) * scale
+
+class RtlTcpCommand:
+    def __init__(self, program, args):
+        self.program = program
+        self.args = args
+    
+    @classmethod
+    def parse(cls, command_line):
+        if command_line.startswith('ExecStart='):
+            command_line = command_line[len('ExecStart='):]
+        tokens = shlex.split(command_line)
+        
+        split = next((i + 1 for i, token in enumerate(tokens)
+                      if 'rtl_tcp' in os.path.basename(token)), None)
+        if split is None:
+            split = next((i for i, token in enumerate(tokens) if token.startswith('-')), len(tokens))
+        program, rest = tokens[:split], tokens[split:]
+        
+        args = []
+        i = 0
+        while i < len(rest):
+            token = rest[i]
+            takes_value = (RTL_TCP_FLAGS[token] is not None if token in RTL_TCP_FLAGS
+                           else token.startswith('-'))
+            # Unknown flags take the next token as value unless it is another flag
+            if takes_value and i + 1 < len(rest) and (token in RTL_TCP_FLAGS or not rest[i + 1].startswith('-')):
+                args.append([token, rest[i + 1]])
+                i += 2
+            else:
+                args.append([token, None])
+                i += 1
+        return cls(program, args)
+    
+    def get(self, key):
+        flag, pattern = RTL_TCP_OPTIONS[key]
+        for arg_flag, value in self.args:
+            if arg_flag == flag:
+                return True if pattern is None else value
+        return False if pattern is None else None
+    
+    # Set, replace or (with "", None or False) remove an option, keeping its position
+    def set(self, key, value):
+        flag, pattern = RTL_TCP_OPTIONS[key]
+        if pattern is None:
+            value = None if value in (True, "true", "1", "on") else False
+        elif value is not None:
+            value = str(value).strip()
+            if value == "":
+                value = False
+            elif not re.fullmatch(pattern, value):
+                raise ValueError(f"Invalid value for {flag}: {value}")
+        
+        if value is False:
+            self.args = [arg for arg in self.args if arg[0] != flag]
+            return
+        for arg in self.args:
+            if arg[0] == flag:
+                arg[1] = value
+                return
+        self.args.append([flag, value])
+    
+    # Raises ValueError for a known flag without a valid value
+    def validate(self):
+        for flag, value in self.args:
+            pattern = RTL_TCP_FLAGS.get(flag)
+            if pattern is not None and (value is None or not re.fullmatch(pattern, value)):
+                raise ValueError(f"Invalid value for {flag}: {value}")
+    
+    def config(self):
+        config = {}
+        for key, (flag, pattern) in RTL_TCP_OPTIONS.items():
+            value = self.get(key)
+            config[key] = value if pattern is None else (value or RTL_TCP_DEFAULTS.get(key, ""))
+        config["program"] = ' '.join(self.program)
+        config["extra_args"] = ' '.join(
+            shlex.quote(token) for arg in self.args if arg[0] not in RTL_TCP_FLAGS
+            for token in arg if token is not None)
+        return config
+    
+    def command_line(self):
+        tokens = list(self.program)
+        for arg in self.args:
+            tokens.extend(token for token in arg if token is not None)
+        return ' '.join(shlex.quote(token) for token in tokens)
+    
+    def exec_start(self):
+        return 'ExecStart=' + self.command_line()
+
+# rtl_tcp control protocol. On connect the server sends a 12-byte header
+# ("RTL0", tuner type, gain count) and then streams IQ; the client sends 5-byte
+# commands (command byte, big-endian 32-bit value). Device settings persist
+# across clients, so a short control connection retunes the running server.
+# rtl_tcp serves one client at a time: while another client is connected the
+# control connection is never accepted and connect() times out on the header.
+RTL_TCP_MAGIC = b'RTL0'
+RTL_TCP_HEADER = struct.Struct('>4sII')
+RTL_TCP_COMMAND = struct.Struct('>BI')
+RTL_TCP_COMMANDS = {
+    "frequency": 0x01,
+    "sample_rate": 0x02,
+    "gain_mode": 0x03,
+    "gain": 0x04,
+    "ppm": 0x05,
+    "if_gain": 0x06,
+    "test_mode": 0x07,
+    "agc": 0x08,
+    "direct_sampling": 0x09,
+    "offset_tuning": 0x0a,
+    "rtl_xtal": 0x0b,
+    "tuner_xtal": 0x0c,
+    "gain_index": 0x0d,
+    "bias_tee": 0x0e
+}
+
+class RtlTcpControl:
+    def __init__(self, host, port, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+        self.tuner_type = None
+        self.gain_count = None
+    
+    def __enter__(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        try:
+            header = b''
+            while len(header) < RTL_TCP_HEADER.size:
+                chunk = self.sock.recv(RTL_TCP_HEADER.size - len(header))
+                if not chunk:
+                    raise ConnectionError("rtl_tcp closed the connection")
+                header += chunk
+            magic, self.tuner_type, self.gain_count = RTL_TCP_HEADER.unpack(header)
+            if magic != RTL_TCP_MAGIC:
+                raise ConnectionError(f"Not an rtl_tcp server (header {magic!r})")
+        except BaseException:
+            self.sock.close()
+            raise
+        return self
+    
+    def __exit__(self, *exc):
+        self.sock.close()
+        self.sock = None
+    
+    def send(self, command, value):
+        self.sock.sendall(RTL_TCP_COMMAND.pack(command, int(value) & 0xffffffff))
+
+# Options rtl_tcp can change at runtime, as control commands for a value
+LIVE_OPTIONS = {
+    "frequency": lambda value: [(RTL_TCP_COMMANDS["frequency"], parse_rtl_number(value or 100e6))],
+    "sample_rate": lambda value: [(RTL_TCP_COMMANDS["sample_rate"], parse_rtl_number(value or 2048000))],
+    # -g is in dB, 0 or unset is automatic gain; the command takes tenths of a dB
+    "gain": lambda value: ([(RTL_TCP_COMMANDS["gain_mode"], 1),
+                            (RTL_TCP_COMMANDS["gain"], round(float(value) * 10))]
+                           if value and float(value) else [(RTL_TCP_COMMANDS["gain_mode"], 0)]),
+    "ppm": lambda value: [(RTL_TCP_COMMANDS["ppm"], int(value or 0))],
+    "bias_tee": lambda value: [(RTL_TCP_COMMANDS["bias_tee"], 1 if value else 0)]
+}
+
+# Control commands that turn the running command into the new one, or None
+# when something that needs a restart changed (program, address, port, -b, -n,
+# -d or unknown flags)
+def live_commands(current, command):
+    if current.program != command.program:
+        return None
+    
+    live_flags = {RTL_TCP_OPTIONS[key][0] for key in LIVE_OPTIONS}
+    def restart_args(cmd):
+        return [arg for arg in cmd.args if arg[0] not in live_flags]
+    if restart_args(current) != restart_args(command):
+        return None
+    
+    commands = []
+    for key, to_commands in LIVE_OPTIONS.items():
+        if current.get(key) != command.get(key):
+            commands.extend(to_commands(command.get(key)))
+    return commands
+
+# rtl_tcp.service parsed once into its ExecStart line and rtl_tcp arguments.
+# The arguments live in an EnvironmentFile that ExecStart expands
+# ("ExecStart=/usr/local/bin/rtl_tcp $RTL_TCP_ARGS"). systemd reads that file
+# on every start, so a config change is an atomic file write plus a restart,
+# with no daemon-reload (which re-parses every unit on the system). Units still
+# using a literal ExecStart are migrated on the first apply.
+# UnitFile re-parses only when either file's inode/mtime/size changes or inotify
+# reports a write or rename in their directories (editors and systemctl edit
+# replace the file), so the config endpoints and the update functions share one model.
+SERVICE_FILE = '/etc/systemd/system/rtl_tcp.service'
+ENV_FILE = '/etc/rtl_web_monitor/rtl_tcp.env'
+ENV_VARIABLE = 'RTL_TCP_ARGS'
+DEFAULT_EXEC_START = "ExecStart=/usr/local/bin/rtl_tcp -a 0.0.0.0 -p 1234 -s 2048000"
+
+# Write via a temporary file and rename, so readers never see a partial file
+def write_file_atomic(path, content):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(path):
+        shutil.copymode(path, temp_path)
+    os.replace(temp_path, path)
+
+# VAR="value" lines of an EnvironmentFile
+def parse_env_file(content):
+    variables = {}
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith(('#', ';')) or '=' not in line:
+            continue
+        name, value = line.split('=', 1)
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = re.sub(r'\\(.)', r'\1', value[1:-1])
+        variables[name.strip()] = value
+    return variables
+
+def format_env_file(args):
+    value = args.replace('\\', '\\\\').replace('"', '\\"')
+    return ("# Written by rtl_web_monitor. rtl_tcp.service passes this to rtl_tcp\n"
+            f"# as ${ENV_VARIABLE}; changes take effect on the next restart.\n"
+            f'{ENV_VARIABLE}="{value}"\n')
+
+class UnitFileModel:
+    __slots__ = ('content', 'exec_start', 'uses_env', 'program', 'command', 'config', 'key')
+    
+    def __init__(self, content, env_content, key):
+        self.content = content
+        self.key = key
+        
+        exec_start_match = re.search(r'(ExecStart=.*)', content)
+        self.exec_start = exec_start_match.group(1) if exec_start_match else None
+        
+        # With the EnvironmentFile layout, exec_start is the expanded command line
+        reference = re.compile(r'\$\{?' + ENV_VARIABLE + r'\}?')
+        self.uses_env = bool(self.exec_start and reference.search(self.exec_start))
+        self.program = None
+        if self.uses_env:
+            try:
+                self.program = RtlTcpCommand.parse(self.exec_start).program
+            except ValueError:
+                pass
+            args = parse_env_file(env_content or '').get(ENV_VARIABLE, '')
+            self.exec_start = reference.sub(lambda match: args, self.exec_start).rstrip()
+        
+        try:
+            self.command = RtlTcpCommand.parse(self.exec_start) if self.exec_start else None
+        except ValueError:
+            # Unbalanced quotes
+            self.command = None
+        self.config = (self.command or RtlTcpCommand.parse(DEFAULT_EXEC_START)).config()
+
+class UnitFile:
+    def __init__(self, path=SERVICE_FILE, env_path=ENV_FILE):
+        self.path = path
+        self.env_path = env_path
+        self.loads = 0
+        self._model = None
+        self._dirty = True
+        self._lock = threading.Lock()
+        self._thread = None
+        self._listeners = []
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+        return self
+    
+    # Called from the watch thread when the unit or its EnvironmentFile changes
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+    
+    def _watch(self):
+        try:
+            inotify = Inotify()
+        except OSError as e:
+            print(f"Unit file watch unavailable, using mtime only: {e}")
+            return
+        try:
+            names = {}
+            for path in (self.path, self.env_path):
+                try:
+                    wd = inotify.add_watch(os.path.dirname(path),
+                                           IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVED_FROM)
+                    names[wd] = os.path.basename(path)
+                except OSError:
+                    pass
+            while True:
+                changed = False
+                for wd, mask, event_name in inotify.read_events():
+                    if names.get(wd) == event_name:
+                        self._dirty = True
+                        changed = True
+                if changed:
+                    for callback in self._listeners:
+                        try:
+                            callback()
+                        except Exception as e:
+                            print(f"Unit file listener failed: {e}")
+        except OSError as e:
+            print(f"Unit file watch stopped, using mtime only: {e}")
+        finally:
+            inotify.close()
+    
+    @staticmethod
+    def _stat_key(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    # Current model; raises OSError if the unit file cannot be read
+    def get(self):
+        key = (self._stat_key(self.path), self._stat_key(self.env_path))
+        with self._lock:
+            if self._dirty or self._model is None or self._model.key != key:
+                self._dirty = False
+                with open(self.path, 'r') as f:
+                    content = f.read()
+                env_content = None
+                if key[1] is not None:
+                    with open(self.env_path, 'r') as f:
+                        env_content = f.read()
+                self._model = UnitFileModel(content, env_content, key)
+                self.loads += 1
+            return self._model
+    
+    def write(self, content):
+        with self._lock:
+            write_file_atomic(self.path, content)
+            self._dirty = True
+    
+    def write_env(self, args):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.env_path), exist_ok=True)
+            write_file_atomic(self.env_path, format_env_file(args))
+            self._dirty = True
+
+unit_file = UnitFile()
+
 # Get full ExecStart command line
 def get_full_exec_command():
     try:
-        service_file = '/etc/systemd/system/rtl_tcp.service'
-        with open(service_file, 'r') as f:
-            content = f.read()
-            
-        exec_start_match = re.search(r'(ExecStart=.*)', content)
-        if exec_start_match:
-            return exec_start_match.group(1)
-        return "ExecStart=/usr/local/bin/rtl_tcp -a 0.0.0.0 -p 1234 -s 2048000"
+        return unit_file.get().exec_start or DEFAULT_EXEC_START
     except Exception as e:
         print(f"Error getting exec command: {str(e)}")
-        return "ExecStart=/usr/local/bin/rtl_tcp -a 0.0.0.0 -p 1234 -s 2048000"
-
-# Update service file with direct command
-def update_direct_command(command_line):
-    try:
-        service_file = '/etc/systemd/system/rtl_tcp.service'
+        return DEFAULT_EXEC_START
+
+# Apply an rtl_tcp command line. When only runtime-changeable options differ,
+# they are sent over the control protocol (through the relay's upstream
+# connection if it holds rtl_tcp, else on a short connection of our own when
+# no client does) and the service keeps running; otherwise it is restarted. Either way the arguments
+# are written to the EnvironmentFile so they survive the next start. The unit
+# itself is only rewritten (and systemd reloaded) the first time, or when the
+# program changes. Each step is timed; collect_jobs publishes the result as
+# status["config_apply"].
+def apply_rtl_tcp_command(command, message):
+    started = time.monotonic()
+    timings = {}
+    
+    args = [token for arg in command.args for token in arg if token is not None]
+    if any(re.search(r'\s', token) or not token for token in args):
+        return False, "rtl_tcp arguments cannot contain whitespace"
+    
+    model = unit_file.get()
+    needs_reload = not model.uses_env or model.program != command.program
+    
+    live = False
+    commands = live_commands(model.command, command) if model.command else None
+    observed = current_snapshot.data
+    if commands is not None and observed["service_running"] and \
+            (iq_relay.connected or not observed["streaming_active"]):
+        job_manager.progress("Applying live")
+        try:
+            if iq_relay.connected:
+                iq_relay.send_commands(commands)
+            else:
+                with RtlTcpControl(*rtl_tcp_endpoint(model.command.config())) as control:
+                    for code, value in commands:
+                        control.send(code, value)
+            live = True
+        except (OSError, ValueError) as e:
+            print(f"Live apply failed, restarting instead: {e}")
+        timings["live_ms"] = round((time.monotonic() - started) * 1000, 1)
+    
+    job_manager.progress("Writing configuration")
+    step_started = time.monotonic()
+    if needs_reload:
+        service_file = unit_file.path
         
         backup_file = f"{service_file}.bak"
         shutil.copy2(service_file, backup_file)
         
-        with open(service_file, 'r') as f:
-            content = f.read()
-            
-        if not command_line.startswith('ExecStart='):
-            command_line = 'ExecStart=' + command_line
-            
+        program = ' '.join(shlex.quote(token) for token in command.program)
         updated_content = re.sub(
             r'ExecStart=.*', 
-            command_line, 
-            content
+            lambda match: f"ExecStart={program} ${ENV_VARIABLE}", 
+            model.content,
+            count=1
         )
-        
-        with open(service_file, 'w') as f:
-            f.write(updated_content)
-        
+        if f"EnvironmentFile=-{unit_file.env_path}" not in updated_content:
+            updated_content = re.sub(
+                r'^ExecStart=',
+                lambda match: f"EnvironmentFile=-{unit_file.env_path}\nExecStart=",
+                updated_content,
+                count=1,
+                flags=re.MULTILINE
+            )
+    
+    unit_file.write_env(' '.join(args))
+    if needs_reload:
+        unit_file.write(updated_content)
+    timings["write_ms"] = round((time.monotonic() - step_started) * 1000, 1)
+    
+    if needs_reload:
+        job_manager.progress("Reloading systemd")
+        step_started = time.monotonic()
         reload_result = subprocess.run(
             ["sudo", "systemctl", "daemon-reload"],
             capture_output=True, text=True, check=False
         )
+        timings["reload_ms"] = round((time.monotonic() - step_started) * 1000, 1)
         
         if reload_result.returncode != 0:
             return False, f"Error reloading systemd: {reload_result.stderr}"
-        
+    
+    if not live:
         # Restart service
+        job_manager.progress("Restarting service")
+        step_started = time.monotonic()
         restart_result = subprocess.run(
             ["sudo", "systemctl", "restart", "rtl_tcp.service"],
             capture_output=True, text=True, check=False
         )
+        service_status_cache.invalidate()
+        timings["restart_ms"] = round((time.monotonic() - step_started) * 1000, 1)
         
         if restart_result.returncode != 0:
             return False, f"Error restarting service: {restart_result.stderr}"
-        
-        return True, "Command updated and service restarted"
+    
+    timings["total_ms"] = round((time.monotonic() - started) * 1000, 1)
+    job_manager.last_apply = {"time": time.time(), "live": live, "daemon_reload": needs_reload, **timings}
+    
+    refresh_streaming_port()
+    
+    how = "applied live" if live else "service restarted"
+    return True, f"{message} and {how} ({timings['total_ms']:.0f} ms)"
+
+# Update service file with direct command
+def update_direct_command(command_line):
+    try:
+        command = RtlTcpCommand.parse(command_line.strip())
+        if not command.program:
+            return False, "Command line has no program"
+        command.validate()
+        return apply_rtl_tcp_command(command, "Command updated")
     
     except Exception as e:
         return False, f"Configuration update error: {str(e)}"
 
 # Get current RTL-TCP configuration
 def get_rtl_tcp_config():
-    config = {
-        "address": "0.0.0.0",
-        "port": "1234",
-        "sample_rate": "2048000"
-    }
-    
     try:
-        with open('/etc/systemd/system/rtl_tcp.service', 'r') as f:
-            content = f.read()
-            
-            exec_start_match = re.search(r'ExecStart=.*rtl_tcp\s+(.*)', content)
-            if exec_start_match:
-                args = exec_start_match.group(1)
-                
-                addr_match = re.search(r'-a\s+([^\s]+)', args)
-                if addr_match:
-                    config["address"] = addr_match.group(1)
-                
-                port_match = re.search(r'-p\s+([^\s]+)', args)
-                if port_match:
-                    config["port"] = port_match.group(1)
-                
-                sample_match = re.search(r'-s\s+([^\s]+)', args)
-                if sample_match:
-                    config["sample_rate"] = sample_match.group(1)
+        return dict(unit_file.get().config)
     except Exception as e:
         print(f"Error loading config file: {str(e)}")
+        return RtlTcpCommand.parse(DEFAULT_EXEC_START).config()
+
+# Suggest -b/-n from the observed backlog. rtl_tcp hands the client one
+# 256 KiB USB buffer at a time, and -n caps how many it queues for a slow client
+# (older ones are dropped), so -n sets how long a link stall can be absorbed.
+# -b (USB transfer buffers) only matters when samples are lost before rtl_tcp.
+RTL_BUFFER_BYTES = 16 * 32 * 512
+RTL_DEFAULT_BUFFERS = 15
+RTL_DEFAULT_MAX_BUFFERS = 500
+ADVICE_STALL_SECONDS = 2.0    # link stall -n should absorb at minimum
+ADVICE_LATENCY_SECONDS = 10.0 # beyond this the queued IQ is too stale to be useful
+
+def get_tuning_advice():
+    config = get_rtl_tcp_config()
+    try:
+        sample_rate = parse_rtl_number(config["sample_rate"])
+    except ValueError:
+        sample_rate = 2048000
+    buffer_seconds = RTL_BUFFER_BYTES / (sample_rate * 2)
+    # A hand-edited unit may hold anything; that option's advice is skipped
+    try:
+        buffers = int(config["buffers"] or RTL_DEFAULT_BUFFERS)
+    except ValueError:
+        buffers = None
+    try:
+        max_buffers = int(config["max_buffers"] or RTL_DEFAULT_MAX_BUFFERS)
+    except ValueError:
+        max_buffers = None
     
-    return config
+    # Only the collector thread touches status; read the published snapshot
+    observed = current_snapshot.data
+    peak = observed["stream_backlog_peak"]
+    delivery_rate = observed["stream_sent_rate"]
+    notes = []
+    
+    # Enough queue for the worst backlog seen (with headroom) and a short stall,
+    # but not so much that a stalled client is fed seconds-old samples
+    suggested_max = max(math.ceil(peak * 1.5), math.ceil(ADVICE_STALL_SECONDS / buffer_seconds))
+    suggested_max = min(suggested_max, math.ceil(ADVICE_LATENCY_SECONDS / buffer_seconds))
+    if max_buffers is None:
+        suggested_max = None
+        notes.append(f"-n {config['max_buffers']} is not a number of buffers; no -n advice.")
+    elif max_buffers and peak >= max_buffers + 2:
+        notes.append(f"Backlog reached the -n {max_buffers} cap: samples were dropped, raise -n.")
+    elif max_buffers and peak >= max_buffers * 0.9:
+        notes.append(f"Backlog peaked at {peak} of {max_buffers} buffers, close to dropping; raise -n.")
+    elif max_buffers * buffer_seconds > ADVICE_LATENCY_SECONDS:
+        notes.append(f"-n {max_buffers} lets a stalled client fall "
+                     f"{max_buffers * buffer_seconds:.0f} s behind; a smaller -n bounds latency.")
+    
+    suggested_buffers = buffers
+    if buffers is None:
+        notes.append(f"-b {config['buffers']} is not a number of buffers; no -b advice.")
+    elif observed["stream_drops"] and not observed["stream_backlog_sustained"]:
+        suggested_buffers = max(buffers, 32)
+        notes.append("Samples were lost while the client kept up: more USB buffers (-b) may help.")
+    
+    suggested_rate = None
+    if observed["stream_backlog_sustained"]:
+        notes.append("The client cannot keep up with this sample rate; a larger -n only delays the drops.")
+        if delivery_rate:
+            supported = [int(rate) for rate in (250000, 1024000, 1536000, 1792000, 1920000, 2048000, 2400000)
+                         if rate * 2 <= delivery_rate * 0.9]
+            if supported:
+                suggested_rate = str(max(supported))
+                notes.append(f"The link delivers {delivery_rate / 1024:.0f} KB/s; "
+                             f"-s {suggested_rate} should fit.")
+    
+    if not notes:
+        notes.append("No backlog problems observed; the suggested values keep a "
+                     f"{ADVICE_STALL_SECONDS:.0f} s margin.")
+    
+    return {
+        "current": {"sample_rate": config["sample_rate"], "buffers": config["buffers"],
+                    "max_buffers": config["max_buffers"]},
+        "observed": {
+            "backlog_peak": peak,
+            "drops": observed["stream_drops"],
+            "drop_rate": observed["stream_drop_rate"],
+            "sustained": observed["stream_backlog_sustained"],
+            "delivery_rate": delivery_rate,
+            "rtt_ms": observed["stream_rtt_ms"]
+        },
+        "buffer_ms": round(buffer_seconds * 1000, 1),
+        "suggested": {
+            "buffers": str(suggested_buffers) if suggested_buffers is not None else None,
+            "max_buffers": str(suggested_max) if suggested_max is not None else None,
+            "sample_rate": suggested_rate
+        },
+        "notes": notes
+    }
 
-def update_rtl_tcp_config(address, port, sample_rate):
+# settings: option key -> value (see RTL_TCP_OPTIONS); other flags are kept
+def update_rtl_tcp_config(settings):
     try:
-        service_file = '/etc/systemd/system/rtl_tcp.service'
-        
-        backup_file = f"{service_file}.bak"
-        shutil.copy2(service_file, backup_file)
-        
-        with open(service_file, 'r') as f:
-            content = f.read()
-        
-        new_exec_start = f"ExecStart=/usr/local/bin/rtl_tcp -a {address} -p {port} -s {sample_rate}"
-        
-        updated_content = re.sub(
-            r'ExecStart=.*rtl_tcp.*', 
-            new_exec_start, 
-            content
-        )
-        
-        with open(service_file, 'w') as f:
-            f.write(updated_content)
-        
-        reload_result = subprocess.run(
-            ["sudo", "systemctl", "daemon-reload"],
-            capture_output=True, text=True, check=False
-        )
-        
-        if reload_result.returncode != 0:
-            return False, f"Error reloading systemd: {reload_result.stderr}"
-        
-        restart_result = subprocess.run(
-            ["sudo", "systemctl", "restart", "rtl_tcp.service"],
-            capture_output=True, text=True, check=False
-        )
+        model = unit_file.get()
+        command = RtlTcpCommand.parse(model.exec_start if model.command else DEFAULT_EXEC_START)
+        for key, value in settings.items():
+            command.set(key, value)
         
-        if restart_result.returncode != 0:
-            return False, f"Error restarting service: {restart_result.stderr}"
-        
-        return True, "Configuration updated and service restarted"
+        return apply_rtl_tcp_command(command, "Configuration updated")
     
     except Exception as e:
         return False, f"Configuration update error: {str(e)}"
@@ -342,6 +2447,7 @@ def create_static_files():
                     <button id="stop-service" class="action-button stop">Stop</button>
                     <button id="restart-service" class="action-button restart">Reboot</button>
                 </div>
+                <div class="hint" id="job-status"></div>
             </div>
             
             <div class="status-item">
@@ -350,6 +2456,9 @@ def create_static_files():
                     <div id="streaming-status" class="status-light"></div>
                     <span id="streaming-text">Loading...</span>
                 </div>
+                <div class="sub-metric" id="stream-clients"></div>
+                <div class="sub-metric" id="stream-backlog"></div>
+                <div class="sub-metric" id="stream-relay"></div>
             </div>
         </div>
         
@@ -359,9 +2468,18 @@ def create_static_files():
                 <pre id="service-status-output">Loading status information...</pre>
             </div>
         </div>
+        
+        <div class="service-info-panel">
+            <h2>RTL-TCP Log</h2>
+            <div class="service-status-output" id="service-log-panel">
+                <pre id="service-log-output"></pre>
+            </div>
+            <div class="hint" id="service-log-state"></div>
+        </div>
 
         <div class="service-config-panel">
             <h2>RTL-TCP Service Configuration</h2>
+            <div class="hint" id="config-apply"></div>
             <div class="config-mode-selector">
                 <label>Configuration Mode:</label>
                 <div class="toggle-group">
@@ -396,6 +2514,43 @@ def create_static_files():
                     </select>
                 </div>
                 
+                <div class="config-item">
+                    <label for="frequency">Frequency (-f):</label>
+                    <input type="text" id="frequency" name="frequency" placeholder="100M">
+                </div>
+                
+                <div class="config-item">
+                    <label for="gain">Gain (-g):</label>
+                    <input type="text" id="gain" name="gain" placeholder="0 = auto">
+                </div>
+                
+                <div class="config-item">
+                    <label for="ppm">Frequency Correction (-P):</label>
+                    <input type="number" id="ppm" name="ppm" placeholder="0">
+                </div>
+                
+                <div class="config-item">
+                    <label for="device">Device Index or Serial (-d):</label>
+                    <input type="text" id="device" name="device" placeholder="0">
+                </div>
+                
+                <div class="config-item">
+                    <label for="buffers">USB Buffers (-b):</label>
+                    <input type="number" id="buffers" name="buffers" placeholder="15" min="1">
+                </div>
+                
+                <div class="config-item">
+                    <label for="max-buffers">Max Queued Buffers (-n):</label>
+                    <input type="number" id="max-buffers" name="max-buffers" placeholder="500" min="1">
+                    <button type="button" id="advice-button" class="toggle-button">Suggest -b / -n</button>
+                    <div class="hint" id="advice-notes"></div>
+                </div>
+                
+                <div class="config-item">
+                    <label><input type="checkbox" id="bias-tee" name="bias-tee"> Bias Tee (-T)</label>
+                    <div class="hint" id="extra-args"></div>
+                </div>
+                
                 <button type="submit" class="action-button">Apply Settings and Restart</button>
             </form>
             
@@ -426,6 +2581,7 @@ def create_static_files():
                 <h2>CPU Temp</h2>
                 <div class="metric-value">
                     <span id="cpu-temp">0</span><span>°C</span>
+                    <div class="sub-metric" id="temp-sensors"></div>
                 </div>
                 <div class="progress-bar">
                     <div id="cpu-temp-bar" class="progress" style="width: 0%;"></div>
@@ -471,6 +2627,12 @@ def create_static_files():
                         <span id="network-sent">0</span>
                         <span> KB/s</span>
                     </div>
+                    <div>
+                        <span>IQ stream: </span>
+                        <span id="stream-sent">0</span>
+                        <span> KB/s</span>
+                    </div>
+                    <div class="sub-metric" id="network-interfaces"></div>
                 </div>
             </div>
         </div>
@@ -730,6 +2892,9 @@ h2 {
     const serviceText = document.getElementById('service-text');
     const streamingStatus = document.getElementById('streaming-status');
     const streamingText = document.getElementById('streaming-text');
+    const streamClients = document.getElementById('stream-clients');
+    const streamBacklog = document.getElementById('stream-backlog');
+    const streamRelay = document.getElementById('stream-relay');
     
     // CPU
     const cpuUsage = document.getElementById('cpu-usage');
@@ -738,6 +2903,7 @@ h2 {
     // CPU temperature
     const cpuTemp = document.getElementById('cpu-temp');
     const cpuTempBar = document.getElementById('cpu-temp-bar');
+    const tempSensors = document.getElementById('temp-sensors');
     
     // Memory
     const memoryPercent = document.getElementById('memory-percent');
@@ -754,6 +2920,8 @@ h2 {
     // Network
     const networkRecv = document.getElementById('network-recv');
     const networkSent = document.getElementById('network-sent');
+    const streamSent = document.getElementById('stream-sent');
+    const networkInterfaces = document.getElementById('network-interfaces');
     
     // Button elements
     const startServiceBtn = document.getElementById('start-service');
@@ -766,11 +2934,6 @@ h2 {
     const easyModeForm = document.getElementById('rtl-tcp-config-form');
     const directModeForm = document.getElementById('direct-edit-form');
     
-    // Previous network values
-    let lastNetworkSent = 0;
-    let lastNetworkRecv = 0;
-    let lastUpdateTime = Date.now();
-    
     // Mode toggle
     easyModeBtn.addEventListener('click', function() {
         easyModeBtn.classList.add('active');
@@ -807,41 +2970,59 @@ h2 {
             });
     }
     
-    // Service operations
-    startServiceBtn.addEventListener('click', () => {
-        fetch('/api/service/start', { method: 'POST' })
+    // Jobs submitted from this page: job id -> message shown on success
+    const pendingJobs = {};
+    const jobStatus = document.getElementById('job-status');
+    
+    // Submit a service job; completion is reported through the status stream
+    function submitJob(url, options, successMessage) {
+        return fetch(url, options)
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    alert('Service started successfully');
+                    pendingJobs[data.job_id] = successMessage;
                 } else {
                     alert('Error: ' + data.message);
                 }
+            })
+            .catch(error => {
+                console.error('Error submitting job:', error);
+                alert('Error occurred while submitting the request');
             });
-    });
+    }
     
-    stopServiceBtn.addEventListener('click', () => {
-        fetch('/api/service/stop', { method: 'POST' })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    alert('Service stopped successfully');
+    // Show running jobs and report the ones this page submitted once they finish
+    function checkJobs(jobs) {
+        const running = jobs.filter(job => job.state === 'queued' || job.state === 'running');
+        jobStatus.textContent = running
+            .map(job => job.action + ': ' + (job.step || job.state) + '...')
+            .join(' / ');
+        
+        jobs.forEach(job => {
+            if (job.id in pendingJobs && job.finished) {
+                const message = pendingJobs[job.id];
+                delete pendingJobs[job.id];
+                if (job.state === 'succeeded') {
+                    alert(job.message || message);
+                    updateServiceStatusOutput();
                 } else {
-                    alert('Error: ' + data.message);
+                    alert('Error: ' + job.message);
                 }
-            });
+            }
+        });
+    }
+    
+    // Service operations
+    startServiceBtn.addEventListener('click', () => {
+        submitJob('/api/service/start', { method: 'POST' }, 'Service started successfully');
+    });
+    
+    stopServiceBtn.addEventListener('click', () => {
+        submitJob('/api/service/stop', { method: 'POST' }, 'Service stopped successfully');
     });
     
     restartServiceBtn.addEventListener('click', () => {
-        fetch('/api/service/restart', { method: 'POST' })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    alert('Service restarted successfully');
-                } else {
-                    alert('Error: ' + data.message);
-                }
-            });
+        submitJob('/api/service/restart', { method: 'POST' }, 'Service restarted successfully');
     });
     
     // Direct edit form submission
@@ -850,27 +3031,13 @@ h2 {
         
         const commandLine = document.getElementById('direct-command').value;
         
-        fetch('/api/service/update_direct', {
+        submitJob('/api/service/update_direct', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({ command: commandLine })
-        })
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                alert('Command updated and service restarted');
-                // Update status
-                updateServiceStatusOutput();
-            } else {
-                alert('Error: ' + data.message);
-            }
-        })
-        .catch(error => {
-            console.error('Error updating command:', error);
-            alert('Error occurred while updating command');
-        });
+        }, 'Command updated and service restarted');
     });
     
     // Set progress bar class
@@ -888,88 +3055,222 @@ h2 {
         return (bytes / (1024 * 1024)).toFixed(0);
     }
     
-    // Update status
+    // Status as last received and the version it corresponds to
+    let statusData = {};
+    let statusVersion = '';
+    let lastServiceKey = null;
+    
+    // Apply a versioned update (full resync or patch); false if it does not fit our version
+    function applyStatusUpdate(update) {
+        if (update.full) {
+            statusData = update.data;
+        } else if (update.base === statusVersion) {
+            Object.assign(statusData, update.changes);
+        } else {
+            statusVersion = '';
+            return false;
+        }
+        statusVersion = update.version;
+        renderStatus(statusData);
+        return true;
+    }
+    
+    // Render status
+    function renderStatus(data) {
+        // Service status
+        if (data.service_running) {
+            serviceStatus.className = 'status-light active';
+            serviceText.textContent = '📡RUNNING📡';
+            startServiceBtn.disabled = true;
+            stopServiceBtn.disabled = false;
+            restartServiceBtn.disabled = false;
+        } else {
+            serviceStatus.className = 'status-light inactive';
+            serviceText.textContent = 'Stopped';
+            startServiceBtn.disabled = false;
+            stopServiceBtn.disabled = true;
+            restartServiceBtn.disabled = true;
+        }
+        
+        // Streaming status
+        if (data.streaming_active) {
+            streamingStatus.className = 'status-light active';
+            streamingText.textContent = data.stream_backlog_sustained ? 'On Air (falling behind)' : 'On Air';
+        } else if (data.service_running) {
+            streamingStatus.className = 'status-light standby';
+            streamingText.textContent = 'Stand By';
+        } else {
+            streamingStatus.className = 'status-light inactive';
+            streamingText.textContent = 'Stopped';
+        }
+        
+        // rtl_tcp buffer backlog (from its "ll+, now N" log lines)
+        if (data.service_running) {
+            let backlogText = 'Backlog ' + data.stream_backlog + ' buffers (peak ' + data.stream_backlog_peak + ')';
+            if (data.stream_dropping) {
+                backlogText += ', at the -n cap: dropping';
+            }
+            if (data.stream_drops) {
+                backlogText += ', ' + data.stream_drops + ' drop periods (~' +
+                    (data.stream_dropped_bytes / 1048576).toFixed(1) + ' MB lost)';
+            }
+            streamBacklog.textContent = backlogText;
+            streamBacklog.style.color = data.stream_backlog_sustained ? '#e74c3c' : '';
+        } else {
+            streamBacklog.textContent = '';
+        }
+        
+        // Relay fan-out: aggregate and per-client throughput
+        const relay = data.relay;
+        if (relay) {
+            streamRelay.textContent = 'Relay :' + relay.port + ' (control: ' + relay.control +
+                ', slow clients: ' + relay.policy + '), ' +
+                relay.clients.length + ' clients, ' + (relay.rate / 1024).toFixed(0) + ' KB/s' +
+                relay.clients.map(client => ' / ' + client.remote + ' ' + (client.rate / 1024).toFixed(0) + ' KB/s' +
+                    (client.controls ? ' (control)' : '') +
+                    ', lag ' + client.lag_ms.toFixed(0) + ' ms' +
+                    (client.dropped_bytes ? ', dropped ' + (client.dropped_bytes / 1024).toFixed(0) + ' KB' : '')).join('') +
+                (relay.disconnected_slow ? ' / ' + relay.disconnected_slow + ' slow clients disconnected' : '');
+        } else {
+            streamRelay.textContent = '';
+        }
+        
+        // Per-client throughput and socket telemetry
+        streamClients.textContent = (data.streaming_clients || []).map(client => {
+            let text = client.remote;
+            if (client.rate !== undefined) {
+                text += ' ' + (client.rate / 1024).toFixed(0) + ' KB/s' +
+                    (client.keeping_up ? '' : ' (falling behind)');
+            }
+            if (client.rtt_ms !== undefined) {
+                text += ', RTT ' + client.rtt_ms.toFixed(1) + ' ms';
+            }
+            if (client.retransmits !== undefined) {
+                text += ', retrans ' + client.retransmits;
+            }
+            return text + ', queue ' + client.queue_ms.toFixed(0) + ' ms';
+        }).join(' / ');
+        
+        // CPU usage
+        cpuUsage.textContent = data.cpu_usage.toFixed(1);
+        cpuBar.style.width = data.cpu_usage + '%';
+        setProgressClass(cpuBar, data.cpu_usage, 70, 90);
+        
+        // CPU temperature
+        cpuTemp.textContent = data.cpu_temp.toFixed(1);
+        
+        // CPU temperature progress bar (0-100°C scale)
+        const tempPercent = Math.min(100, Math.max(0, data.cpu_temp * 100 / 100));
+        cpuTempBar.style.width = tempPercent + '%';
+        setProgressClass(cpuTempBar, data.cpu_temp, 60, 80);
+        
+        // All temperature sensors
+        tempSensors.textContent = (data.temperatures || [])
+            .map(sensor => sensor.label + ': ' + sensor.temp.toFixed(1) + '°C')
+            .join(' / ');
+        
+        // Memory usage
+        memoryPercent.textContent = data.memory_percent.toFixed(1);
+        memoryAvailable.textContent = bytesToMB(data.memory_available);
+        memoryTotal.textContent = bytesToMB(data.memory_total);
+        memoryBar.style.width = data.memory_percent + '%';
+        setProgressClass(memoryBar, data.memory_percent, 70, 90);
+        
+        // Swap usage
+        swapPercent.textContent = data.swap_percent.toFixed(1);
+        swapFree.textContent = bytesToMB(data.swap_free);
+        swapTotal.textContent = bytesToMB(data.swap_total);
+        swapBar.style.width = data.swap_percent + '%';
+        setProgressClass(swapBar, data.swap_percent, 70, 90);
+        
+        // Network usage (KB/s, computed by the server)
+        networkSent.textContent = (data.network_sent_rate / 1024).toFixed(2);
+        networkRecv.textContent = (data.network_recv_rate / 1024).toFixed(2);
+        streamSent.textContent = (data.stream_sent_rate / 1024).toFixed(2);
+        networkInterfaces.textContent = Object.entries(data.network_interfaces || {})
+            .filter(([name, nic]) => name !== 'lo')
+            .map(([name, nic]) => name + ' ↓' + (nic.recv_rate / 1024).toFixed(1) +
+                ' ↑' + (nic.sent_rate / 1024).toFixed(1))
+            .join(' / ');
+        
+        // Job progress and completion
+        checkJobs(data.jobs || []);
+        
+        // Timing of the last configuration apply
+        const apply = data.config_apply;
+        document.getElementById('config-apply').textContent = apply ?
+            'Last apply: ' + apply.total_ms.toFixed(0) + ' ms (' +
+            (apply.live ? 'live ' + apply.live_ms.toFixed(0) + ' ms, ' : '') +
+            'write ' + apply.write_ms.toFixed(0) + ' ms' +
+            (apply.daemon_reload ? ', daemon-reload ' + (apply.reload_ms || 0).toFixed(0) + ' ms' : '') +
+            (apply.live ? '' : ', restart ' + apply.restart_ms.toFixed(0) + ' ms') + ')' : '';
+        
+        // Refresh the systemctl output only when the service or its process changed
+        const serviceKey = data.service_running + ':' + data.rtl_tcp_pid;
+        if (serviceKey !== lastServiceKey) {
+            lastServiceKey = serviceKey;
+            updateServiceStatusOutput();
+        }
+    }
+    
+    // Update status (polling fallback)
     function updateStatus() {
-        fetch('/api/status')
+        fetch('/api/status?since=' + encodeURIComponent(statusVersion))
             .then(response => response.json())
-            .then(data => {
-                // Current time
-                const now = Date.now();
-                const timeDiff = (now - lastUpdateTime) / 1000; // in seconds
-                
-                // Service status
-                if (data.service_running) {
-                    serviceStatus.className = 'status-light active';
-                    serviceText.textContent = '📡RUNNING📡';
-                    startServiceBtn.disabled = true;
-                    stopServiceBtn.disabled = false;
-                    restartServiceBtn.disabled = false;
-                } else {
-                    serviceStatus.className = 'status-light inactive';
-                    serviceText.textContent = 'Stopped';
-                    startServiceBtn.disabled = false;
-                    stopServiceBtn.disabled = true;
-                    restartServiceBtn.disabled = true;
-                }
-                
-                // Streaming status
-                if (data.streaming_active) {
-                    streamingStatus.className = 'status-light active';
-                    streamingText.textContent = 'On Air';
-                } else if (data.service_running) {
-                    streamingStatus.className = 'status-light standby';
-                    streamingText.textContent = 'Stand By';
-                } else {
-                    streamingStatus.className = 'status-light inactive';
-                    streamingText.textContent = 'Stopped';
-                }
-                
-                // CPU usage
-                cpuUsage.textContent = data.cpu_usage.toFixed(1);
-                cpuBar.style.width = data.cpu_usage + '%';
-                setProgressClass(cpuBar, data.cpu_usage, 70, 90);
-                
-                // CPU temperature
-                cpuTemp.textContent = data.cpu_temp.toFixed(1);
-                
-                // CPU temperature progress bar (0-100°C scale)
-                const tempPercent = Math.min(100, Math.max(0, data.cpu_temp * 100 / 100));
-                cpuTempBar.style.width = tempPercent + '%';
-                setProgressClass(cpuTempBar, data.cpu_temp, 60, 80);
-                
-                // Memory usage
-                memoryPercent.textContent = data.memory_percent.toFixed(1);
-                memoryAvailable.textContent = bytesToMB(data.memory_available);
-                memoryTotal.textContent = bytesToMB(data.memory_total);
-                memoryBar.style.width = data.memory_percent + '%';
-                setProgressClass(memoryBar, data.memory_percent, 70, 90);
-                
-                // Swap usage
-                swapPercent.textContent = data.swap_percent.toFixed(1);
-                swapFree.textContent = bytesToMB(data.swap_free);
-                swapTotal.textContent = bytesToMB(data.swap_total);
-                swapBar.style.width = data.swap_percent + '%';
-                setProgressClass(swapBar, data.swap_percent, 70, 90);
-                
-                // Network usage (KB/s)
-                if (lastNetworkSent > 0 && timeDiff > 0) {
-                    const sentRate = (data.network_sent - lastNetworkSent) / 1024 / timeDiff;
-                    const recvRate = (data.network_recv - lastNetworkRecv) / 1024 / timeDiff;
-                    
-                    networkSent.textContent = sentRate.toFixed(2);
-                    networkRecv.textContent = recvRate.toFixed(2);
-                }
-                
-                // Update previous values
-                lastNetworkSent = data.network_sent;
-                lastNetworkRecv = data.network_recv;
-                lastUpdateTime = now;
-            })
+            .then(update => applyStatusUpdate(update))
             .catch(error => {
                 console.error('Error fetching status:', error);
             });
     }
     
+    let pollTimer = null;
+    
+    function pollOnce() {
+        updateStatus();
+        pollLogs();
+    }
+    
+    function startPolling() {
+        if (pollTimer === null) {
+            pollOnce();
+            pollTimer = setInterval(pollOnce, 1000);
+        }
+    }
+    
+    function stopPolling() {
+        if (pollTimer !== null) {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        }
+    }
+    
+    // Live status via Server-Sent Events; poll while the stream is unavailable
+    function startStatusStream() {
+        if (!window.EventSource) {
+            startPolling();
+            return;
+        }
+        
+        const source = new EventSource('/api/events?since=' + encodeURIComponent(statusVersion) +
+                                       '&logs=' + logCursor);
+        source.addEventListener('status', event => {
+            stopPolling();
+            if (!applyStatusUpdate(JSON.parse(event.data))) {
+                // Out of sync: reconnect for a full resync
+                source.close();
+                startStatusStream();
+            }
+        });
+        source.addEventListener('log', event => applyLogUpdate(JSON.parse(event.data)));
+        // Reconnect with the current cursors (an automatic reconnect would reuse
+        // this URL and replay the log); polling covers the gap
+        source.onerror = () => {
+            source.close();
+            startPolling();
+            setTimeout(startStatusStream, 3000);
+        };
+    }
+    
     // Get and display service status
     function updateServiceStatusOutput() {
         fetch('/api/service/status')
@@ -987,6 +3288,44 @@ h2 {
             });
     }
 
+    // Follow the rtl_tcp journal: lines after the last cursor arrive as "log"
+    // events on the status stream, or from /api/logs while polling
+    let logCursor = 0;
+    const LOG_MAX_LINES = 500;
+    
+    function formatLogEntry(entry) {
+        const time = new Date(entry.time * 1000).toLocaleTimeString();
+        return time + ' ' + entry.message;
+    }
+    
+    function applyLogUpdate(data) {
+        const panel = document.getElementById('service-log-panel');
+        const output = document.getElementById('service-log-output');
+        const atBottom = panel.scrollTop + panel.clientHeight >= panel.scrollHeight - 5;
+        
+        if (data.cursor < logCursor || data.truncated) {
+            output.textContent = '';
+        }
+        if (data.entries.length) {
+            const lines = output.textContent ? output.textContent.split('\\n') : [];
+            data.entries.forEach(entry => lines.push(formatLogEntry(entry)));
+            output.textContent = lines.slice(-LOG_MAX_LINES).join('\\n');
+            if (atBottom) {
+                panel.scrollTop = panel.scrollHeight;
+            }
+        }
+        logCursor = data.cursor;
+        document.getElementById('service-log-state').textContent =
+            data.follower.error ? 'Journal: ' + data.follower.error : '';
+    }
+    
+    function pollLogs() {
+        fetch('/api/logs?after=' + logCursor)
+            .then(response => response.json())
+            .then(applyLogUpdate)
+            .catch(error => console.error('Error fetching logs:', error));
+    }
+
     // Get current configuration
     function loadCurrentConfig() {
         fetch('/api/service/config')
@@ -995,6 +3334,15 @@ h2 {
                 if (data.success) {
                     document.getElementById('address').value = data.address || '0.0.0.0';
                     document.getElementById('port').value = data.port || '1234';
+                    document.getElementById('frequency').value = data.frequency || '';
+                    document.getElementById('gain').value = data.gain || '';
+                    document.getElementById('ppm').value = data.ppm || '';
+                    document.getElementById('device').value = data.device || '';
+                    document.getElementById('buffers').value = data.buffers || '';
+                    document.getElementById('max-buffers').value = data.max_buffers || '';
+                    document.getElementById('bias-tee').checked = !!data.bias_tee;
+                    document.getElementById('extra-args').textContent =
+                        data.extra_args ? 'Other arguments (kept): ' + data.extra_args : '';
                     
                     // Set sample rate dropdown
                     const sampleRateSelect = document.getElementById('sample-rate');
@@ -1037,110 +3385,258 @@ h2 {
                 const configData = {
                     address: address,
                     port: port,
-                    sample_rate: sampleRate
+                    sample_rate: sampleRate,
+                    frequency: document.getElementById('frequency').value,
+                    gain: document.getElementById('gain').value,
+                    ppm: document.getElementById('ppm').value,
+                    device: document.getElementById('device').value,
+                    buffers: document.getElementById('buffers').value,
+                    max_buffers: document.getElementById('max-buffers').value,
+                    bias_tee: document.getElementById('bias-tee').checked
                 };
                 
                 // Update configuration
-                fetch('/api/service/update_config', {
+                submitJob('/api/service/update_config', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json'
                     },
                     body: JSON.stringify(configData)
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        alert('RTL-TCP configuration updated and service restarted');
-                        // Update status
-                        updateServiceStatusOutput();
-                    } else {
-                        alert('Error: ' + data.message);
-                    }
-                })
-                .catch(error => {
-                    console.error('Error updating config:', error);
-                    alert('Error occurred while updating configuration');
-                });
+                }, 'RTL-TCP configuration updated and service restarted');
+            });
+            
+            // Fill -b/-n from the advisor; applying is still up to the user
+            document.getElementById('advice-button').addEventListener('click', function() {
+                fetch('/api/service/advice')
+                    .then(response => response.json())
+                    .then(data => {
+                        // null: the unit's value is not a number, so there is no advice for it
+                        if (data.suggested.buffers !== null) {
+                            document.getElementById('buffers').value = data.suggested.buffers;
+                        }
+                        if (data.suggested.max_buffers !== null) {
+                            document.getElementById('max-buffers').value = data.suggested.max_buffers;
+                        }
+                        document.getElementById('advice-notes').textContent = data.notes.join(' ');
+                    })
+                    .catch(error => {
+                        console.error('Error fetching advice:', error);
+                    });
             });
         }
     }
     
-    // Initial status update
-    updateStatus();
-    
-    // Regular status updates (every 1 second)
-    setInterval(updateStatus, 1000);
+    // Live status updates and rtl_tcp log (falls back to polling every 1 second)
+    startStatusStream();
     
-    // Service status regular updates
-    updateServiceStatusOutput();
-    setInterval(updateServiceStatusOutput, 5000); // Every 5 seconds
+    // Service status output also refreshes on service state changes
+    setInterval(updateServiceStatusOutput, 30000); // Every 30 seconds
     
     // Initialize config form
     loadCurrentConfig();
     setupConfigForm();
 });""")
 
+# Any page or API request keeps full-rate collection going
+@app.before_request
+def track_client_access():
+    if request.endpoint != 'static':
+        note_client_access()
+
 # Root route
 @app.route('/')
 def index():
     return render_template('index.html')
 
 # API endpoint - Get current status
+# With ?since=<version> the reply is a versioned update (patch or full resync).
+# With ?wait_for_version=<version>&timeout=<s> the request is held until a newer
+# snapshot is published (long-poll); on timeout the unchanged snapshot is returned.
+LONG_POLL_MAX_TIMEOUT = 60
+
 @app.route('/api/status')
 def api_status():
-    return jsonify(status)
+    snapshot = current_snapshot
+    if 'wait_for_version' in request.args:
+        try:
+            timeout = min(max(float(request.args.get('timeout', 30)), 0), LONG_POLL_MAX_TIMEOUT)
+        except ValueError:
+            return jsonify({"success": False, "message": "timeout must be a number"}), 400
+        snapshot = wait_for_snapshot(parse_version(request.args['wait_for_version']), timeout)
+    
+    if 'since' in request.args:
+        base = find_snapshot(request.args['since'])
+        response = Response(encode_status_update(base, snapshot), mimetype='application/json')
+    elif request.if_none_match.contains(snapshot.etag):
+        response = Response(status=304)
+    else:
+        response = Response(snapshot.body, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# API endpoint - Server-Sent Events stream of versioned status updates.
+# Resumes from ?since=<version> or Last-Event-ID with a patch when possible,
+# then sends one patch per published snapshot; comments keep idle connections alive.
+# With ?logs=<seq> the same stream also carries rtl_tcp journal lines after that
+# cursor as "log" events (same body as /api/logs), so a dashboard holds one worker.
+SSE_KEEPALIVE = 15
+LOG_EVENT_LIMIT = 500
+
+# New journal lines wake the event streams like a new snapshot does
+def notify_log_entry(entry):
+    with snapshot_published:
+        snapshot_published.notify_all()
+
+journal_follower.add_listener(notify_log_entry)
+
+# Wait for a snapshot newer than version or (if log_seq is given) a journal line after log_seq
+def wait_for_events(version, log_seq, timeout):
+    with snapshot_published:
+        snapshot_published.wait_for(
+            lambda: current_snapshot.version > version or
+                    (log_seq is not None and journal_follower.last_seq > log_seq), timeout)
+        return current_snapshot
+
+@app.route('/api/events')
+def api_events():
+    base = find_snapshot(request.args.get('since') or request.headers.get('Last-Event-ID'))
+    try:
+        log_cursor = int(request.args['logs']) if 'logs' in request.args else None
+    except ValueError:
+        log_cursor = None
+    
+    def log_event():
+        nonlocal log_cursor
+        update = read_log_update(log_cursor, LOG_EVENT_LIMIT)
+        log_cursor = update["cursor"]
+        return b"event: log\ndata: " + json.dumps(update).encode() + b"\n\n"
+    
+    def stream():
+        last = current_snapshot
+        yield b"id: %s\nevent: status\ndata: " % last.etag.encode() + \
+            encode_status_update(base, last) + b"\n\n"
+        if log_cursor is not None:
+            yield log_event()
+        while True:
+            snapshot = wait_for_events(last.version, log_cursor, SSE_KEEPALIVE)
+            # An open stream counts as someone watching
+            note_client_access()
+            sent = False
+            if snapshot.version != last.version:
+                yield b"id: %s\nevent: status\ndata: " % snapshot.etag.encode() + \
+                    encode_status_update(last, snapshot) + b"\n\n"
+                last = snapshot
+                sent = True
+            if log_cursor is not None and journal_follower.last_seq > log_cursor:
+                yield log_event()
+                sent = True
+            if not sent:
+                yield b": keepalive\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# API endpoint - History of numeric status fields
+# /api/history?field=cpu_usage,cpu_temp&from=-3600&to=0&step=60
+# from/to are unix times; zero or negative values are relative to now.
+@app.route('/api/history')
+def api_history():
+    fields = [f for f in request.args.get('field', '').split(',') if f]
+    if not fields:
+        return jsonify({
+            "success": True,
+            "fields": list(history.columns),
+            "capacity": history.capacity,
+            "memory_bytes": history.memory_bytes()
+        })
+    
+    unknown = [f for f in fields if f not in history.columns]
+    if unknown:
+        return jsonify({"success": False, "message": f"Unknown field: {', '.join(unknown)}"}), 400
+    
+    try:
+        now = time.time()
+        start = float(request.args.get('from', -3600))
+        end = float(request.args.get('to', 0))
+        step = float(request.args['step']) if 'step' in request.args else None
+    except ValueError:
+        return jsonify({"success": False, "message": "from, to and step must be numbers"}), 400
+    if not (math.isfinite(start) and math.isfinite(end)) or \
+            (step is not None and not (math.isfinite(step) and step > 0)):
+        return jsonify({"success": False, "message": "from, to and step must be finite and step positive"}), 400
+    if start <= 0:
+        start += now
+    if end <= 0:
+        end += now
+    if end < start:
+        return jsonify({"success": False, "message": "to must not be before from"}), 400
+    if step is None:
+        step = max(1.0, (end - start) / 600)
+    
+    series = {f: history.query(f, start, end, step) for f in fields}
+    return jsonify({"success": True, "from": start, "to": end, "step": step, "series": series})
+
+# API endpoint - Collector timing
+@app.route('/api/collectors')
+def api_collectors():
+    return jsonify(scheduler.stats())
+
+# 202 reply for a submitted (or joined) job
+def job_accepted(job, created):
+    return jsonify({
+        "success": True,
+        "job_id": job["id"],
+        "state": job["state"],
+        "coalesced": not created
+    }), 202
 
 # API endpoint - Start service
 @app.route('/api/service/start', methods=['POST'])
 def api_service_start():
-    try:
-        result = subprocess.run(
-            ["sudo", "systemctl", "start", "rtl_tcp.service"],
-            capture_output=True, text=True, check=False
-        )
-        if result.returncode == 0:
-            return jsonify({"success": True})
-        else:
-            return jsonify({"success": False, "message": result.stderr})
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)})
+    return job_accepted(*job_manager.submit("start", control_service, "start"))
 
 # API endpoint - Stop service
 @app.route('/api/service/stop', methods=['POST'])
 def api_service_stop():
-    try:
-        result = subprocess.run(
-            ["sudo", "systemctl", "stop", "rtl_tcp.service"],
-            capture_output=True, text=True, check=False
-        )
-        if result.returncode == 0:
-            return jsonify({"success": True})
-        else:
-            return jsonify({"success": False, "message": result.stderr})
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)})
+    return job_accepted(*job_manager.submit("stop", control_service, "stop"))
 
 # API endpoint - Restart service
 @app.route('/api/service/restart', methods=['POST'])
 def api_service_restart():
-    try:
-        result = subprocess.run(
-            ["sudo", "systemctl", "restart", "rtl_tcp.service"],
-            capture_output=True, text=True, check=False
-        )
-        if result.returncode == 0:
-            return jsonify({"success": True})
-        else:
-            return jsonify({"success": False, "message": result.stderr})
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)})
+    return job_accepted(*job_manager.submit("restart", control_service, "restart"))
+
+# API endpoint - Job list / single job
+@app.route('/api/jobs')
+def api_jobs():
+    return jsonify({"success": True, "jobs": job_manager.summary()})
+
+@app.route('/api/jobs/<job_id>')
+def api_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Unknown job"}), 404
+    return jsonify({"success": True, **job})
 
 # API endpoint - Get service status
 @app.route('/api/service/status')
 def api_service_status():
     status_output = get_service_status("rtl_tcp.service")
-    return jsonify({"success": True, "output": status_output})
+    return jsonify({"success": True, "output": status_output, "cache": service_status_cache.stats()})
+
+# API endpoint - rtl_tcp journal lines after a cursor.
+# ?after=<seq> returns only newer lines; with &timeout=<s> the request is held
+# until a line arrives (long-poll). "cursor" in the reply is the next ?after.
+@app.route('/api/logs')
+def api_logs():
+    try:
+        after = int(request.args.get('after', 0))
+        limit = min(max(int(request.args.get('limit', 500)), 1), 1000)
+        timeout = min(max(float(request.args.get('timeout', 0)), 0), LONG_POLL_MAX_TIMEOUT)
+    except ValueError:
+        return jsonify({"success": False, "message": "after, limit and timeout must be numbers"}), 400
+    
+    return jsonify({"success": True, **read_log_update(after, limit, timeout)})
 
 # API endpoint - Get current configuration
 @app.route('/api/service/config')
@@ -1160,16 +3656,24 @@ def api_update_config():
     try:
         data = request.json
         
-        address = data.get('address', '0.0.0.0')
-        port = data.get('port', '1234')
-        sample_rate = data.get('sample_rate', '2048000')
+        # Only the given options change; validate them before queueing the job
+        settings = {key: data[key] for key in RTL_TCP_OPTIONS if key in data}
+        for key, default in RTL_TCP_DEFAULTS.items():
+            if not str(settings.get(key, default)).strip():
+                settings[key] = default
+        check = RtlTcpCommand([], [])
+        for key, value in settings.items():
+            check.set(key, value)
         
-        success, message = update_rtl_tcp_config(address, port, sample_rate)
-        
-        return jsonify({"success": success, "message": message})
+        return job_accepted(*job_manager.submit("update_config", update_rtl_tcp_config, settings))
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+# API endpoint - -b/-n (and sample rate) suggestions from observed backlog
+@app.route('/api/service/advice')
+def api_service_advice():
+    return jsonify({"success": True, **get_tuning_advice()})
+
 # API endpoint - Update direct command
 @app.route('/api/service/update_direct', methods=['POST'])
 def api_update_direct():
@@ -1177,16 +3681,109 @@ def api_update_direct():
         data = request.json
         command = data.get('command', '')
         
-        success, message = update_direct_command(command)
-        
-        return jsonify({"success": success, "message": message})
+        return job_accepted(*job_manager.submit("update_direct", update_direct_command, command))
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+# HTTP serving. "auto" (default) uses waitress when it is installed, which keeps
+# HTTP/1.1 connections alive between requests, and "threaded" otherwise.
+# "threaded" is a werkzeug server with a fixed pool of worker threads: while
+# every worker is busy the accept loop stops and new connections wait in the
+# listen backlog. Werkzeug closes the connection after every response, and idle
+# or stalled sockets are dropped after --timeout. Long-lived requests (SSE) hold
+# a worker each, so size --threads for the expected dashboards.
+# Per-request access logging is off unless --access-log is given.
+# All workers share this process's single collector thread.
+class PooledWSGIServer(BaseWSGIServer):
+    multithread = True
+    
+    def __init__(self, host, port, app, threads=16, backlog=64, timeout=30, access_log=False):
+        attrs = {'protocol_version': 'HTTP/1.1', 'timeout': timeout}
+        if not access_log:
+            attrs['log_request'] = lambda self, *args, **kwargs: None
+        handler = type('PooledRequestHandler', (WSGIRequestHandler,), attrs)
+        self.request_queue_size = backlog
+        super().__init__(host, port, app, handler=handler)
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+    
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        self._pool.submit(self._process_request_worker, request, client_address)
+    
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="RTL-SDR web monitor")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5678)
+    parser.add_argument('--server', choices=['auto', 'threaded', 'waitress', 'dev'], default='auto',
+                        help="auto: waitress if installed, else threaded; threaded: pooled werkzeug "
+                             "server (no keep-alive); waitress: waitress if installed; "
+                             "dev: Flask development server (for comparison)")
+    parser.add_argument('--threads', type=int, default=16, help="worker threads")
+    parser.add_argument('--backlog', type=int, default=64, help="pending connection queue")
+    parser.add_argument('--timeout', type=float, default=30, help="socket timeout in seconds")
+    parser.add_argument('--access-log', action='store_true', help="log every request")
+    parser.add_argument('--relay-port', type=int,
+                        help="serve rtl_tcp's stream to many clients on this port (rtl_tcp itself "
+                             "must listen elsewhere, e.g. -a 127.0.0.1 or another -p)")
+    parser.add_argument('--relay-host', default='0.0.0.0')
+    parser.add_argument('--relay-control', choices=RELAY_CONTROL_POLICIES, default='first',
+                        help="which relay clients may send rtl_tcp commands")
+    parser.add_argument('--relay-slow-policy', choices=RELAY_SLOW_POLICIES, default='drop_oldest',
+                        help="what to do with a relay client that lags more than --relay-max-lag")
+    parser.add_argument('--relay-max-lag', type=float, default=500,
+                        help="most IQ a relay client may be behind, in ms")
+    parser.add_argument('--relay-slots', type=int, default=128,
+                        help=f"relay ring size in chunks of up to {RELAY_CHUNK_BYTES // 1024} KiB")
+    parser.add_argument('--status-ttl', type=float, default=5.0,
+                        help="seconds to reuse \"systemctl status\" output between clients")
+    return parser.parse_args()
+
+def serve(args):
+    if args.server in ('auto', 'waitress'):
+        try:
+            import waitress
+        except ImportError:
+            if args.server == 'waitress':
+                print("waitress is not installed, using the threaded server")
+        else:
+            waitress.serve(app, host=args.host, port=args.port, threads=args.threads,
+                           backlog=args.backlog, channel_timeout=args.timeout,
+                           connection_limit=args.threads + args.backlog)
+            return
+    elif args.server == 'dev':
+        # No reloader: it would start a second collector. No debugger either: it
+        # would offer a Python console to anyone who can reach --host.
+        app.run(host=args.host, port=args.port, debug=False, use_reloader=False)
+        return
+    
+    print(f"Serving on {args.host}:{args.port} ({args.threads} threads, backlog {args.backlog})")
+    PooledWSGIServer(args.host, args.port, app, args.threads, args.backlog, args.timeout,
+                     args.access_log).serve_forever()
+
 if __name__ == "__main__":
+    args = parse_args()
+    service_status_cache.ttl = args.status_ttl
+    
     create_static_files()
     
+    service_tracker.start()
+    journal_follower.start()
+    unit_file.start()
+    if args.relay_port:
+        iq_relay.start(args.relay_host, args.relay_port, args.relay_slots, args.relay_control,
+                           args.relay_slow_policy, args.relay_max_lag)
+    
     status_thread = threading.Thread(target=update_status_loop, daemon=True)
     status_thread.start()
     
-    app.run(host='0.0.0.0', port=5678, debug=True)
\ No newline at end of file
+    serve(args)
\ No newline at end of file
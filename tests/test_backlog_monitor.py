@@ -0,0 +1,66 @@
+import importlib.util
+import os
+
+import pytest
+
+MONITOR = os.path.join(os.path.dirname(__file__), '..', 'rtl_web_monitor_non-gpio.py')
+
+
+@pytest.fixture(scope='module')
+def monitor():
+    spec = importlib.util.spec_from_file_location('rtl_web_monitor_non_gpio', MONITOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def feed(backlog, start, messages, pid="1"):
+    for n, message in enumerate(messages):
+        backlog.handle({"message": message, "pid": pid, "time": start + n * 0.1})
+
+
+def test_client_disconnect_ends_drop_period(monitor):
+    backlog = monitor.BacklogMonitor(max_depth=4, stream_rate=4096000)
+    start = backlog.started + 1
+    feed(backlog, start, [f"ll+, now {depth}" for depth in range(1, 7)])
+    assert backlog.is_dropping()
+    
+    # rtl_tcp frees its list when the client leaves, without an ll line
+    backlog.handle({"message": "all threads dead..", "pid": "1", "time": start + 2})
+    assert backlog.depth == 0
+    assert not backlog.is_dropping()
+    assert not backlog.is_sustained(start + 60)
+    lost = backlog.estimated_dropped_bytes(start + 2)
+    assert lost > 0
+    assert backlog.estimated_dropped_bytes(start + 60) == lost
+
+
+def test_collector_resets_backlog_without_client(monitor):
+    monitor.backlog_monitor = monitor.BacklogMonitor(max_depth=4, stream_rate=4096000)
+    start = monitor.backlog_monitor.started + 1
+    feed(monitor.backlog_monitor, start, [f"ll+, now {depth}" for depth in range(1, 7)])
+    monitor.status["service_running"] = True
+    monitor.status["streaming_active"] = False
+    
+    monitor.collect_backlog()
+    assert monitor.status["stream_backlog"] == 0
+    assert not monitor.status["stream_dropping"]
+    assert not monitor.status["stream_backlog_sustained"]
+
+
+@pytest.mark.parametrize("peak, drops", [(5, 0), (6, 1)])
+def test_drop_period_starts_at_cap_plus_two(monitor, peak, drops):
+    # With -n 4 rtl_tcp frees buffers only once 6 are queued behind the head
+    backlog = monitor.BacklogMonitor(max_depth=4, stream_rate=4096000)
+    start = backlog.started + 1
+    feed(backlog, start, [f"ll+, now {depth}" for depth in range(1, peak + 1)])
+    assert backlog.drops == drops
+    assert backlog.is_dropping() == bool(drops)
+    assert (backlog.estimated_dropped_bytes(start + 5) > 0) == bool(drops)
+
+
+def test_unbounded_list_never_drops(monitor):
+    backlog = monitor.BacklogMonitor(max_depth=0, stream_rate=4096000)
+    feed(backlog, backlog.started + 1, [f"ll+, now {depth}" for depth in range(1, 600)])
+    assert backlog.drops == 0
+    assert not backlog.is_dropping()